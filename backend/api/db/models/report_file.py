@@ -39,6 +39,7 @@ class ReportFile(Base):
     s3_bucket: Mapped[str] = mapped_column(Text)
     s3_key: Mapped[str] = mapped_column(Text)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sha256: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 from backend.api.config.settings import get_settings
 from backend.api.routes.reports import router as reports_router
 from backend.api.routes.report_files import router as report_files_router
+from backend.api.routes.cache import router as cache_router
 from backend.api.db.models.report import Base
 from backend.api.db.session import engine
 
@@ -30,8 +32,18 @@ app.add_middleware(
 async def startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text("ALTER TABLE report_files ADD COLUMN IF NOT EXISTS sha256 TEXT")
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_report_files_sha256 "
+                "ON report_files (sha256)"
+            )
+        )
     print(f"API running in {settings.env} mode")
 
 
 app.include_router(report_files_router)
 app.include_router(reports_router)
+app.include_router(cache_router)
@@ -0,0 +1,103 @@
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException
+from backend.api.config.settings import get_settings
+from backend.api.s3_client import (
+    object_last_modified,
+    presigned_get_object,
+    presigned_put_object,
+)
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+settings = get_settings()
+
+# Lookups from every worker pass through here, so this is where cache
+# effectiveness is counted; kept in memory since the process started.
+_stats: dict[str, Counter] = {}
+_stats_since = datetime.now(timezone.utc)
+
+_SAFE_SEGMENT = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+# Namespaces holding something other than JSON: (extension, content type)
+NAMESPACE_FORMATS = {
+    "renders": ("pdf", "application/pdf"),
+}
+
+
+def cache_format(namespace: str) -> tuple[str, str]:
+    return NAMESPACE_FORMATS.get(namespace, ("json", "application/json"))
+
+
+def cache_object_name(namespace: str, key: str) -> str:
+    if not _SAFE_SEGMENT.match(namespace) or not _SAFE_SEGMENT.match(key):
+        raise HTTPException(400, "Invalid cache namespace or key")
+    return f"cache/{namespace}/{key}.{cache_format(namespace)[0]}"
+
+
+def record(namespace: str, event: str):
+    _stats.setdefault(namespace, Counter())[event] += 1
+
+
+@router.get("/stats")
+async def get_cache_stats():
+    namespaces = {}
+    for namespace, counts in sorted(_stats.items()):
+        lookups = counts["hits"] + counts["misses"] + counts["expired"]
+        namespaces[namespace] = {
+            "hits": counts["hits"],
+            "misses": counts["misses"],
+            "expired": counts["expired"],
+            "uploads": counts["uploads"],
+            "hit_rate": round(counts["hits"] / lookups, 4) if lookups else None,
+        }
+    return {"since": _stats_since, "namespaces": namespaces}
+
+
+@router.get("/{namespace}/{key}")
+async def get_cache_entry(namespace: str, key: str, max_age: int | None = None):
+    object_name = cache_object_name(namespace, key)
+
+    try:
+        last_modified = object_last_modified(settings.s3_bucket, object_name)
+    except Exception as e:
+        raise HTTPException(500, f"Error reading cache entry: {e}")
+
+    if last_modified is None:
+        record(namespace, "misses")
+        raise HTTPException(404, "Cache miss")
+    age = datetime.now(timezone.utc) - last_modified
+    if max_age is not None and age > timedelta(seconds=max_age):
+        record(namespace, "expired")
+        raise HTTPException(404, "Cache entry expired")
+
+    try:
+        download_url = presigned_get_object(
+            bucket_name=settings.s3_bucket,
+            object_name=object_name,
+            expires=timedelta(minutes=15),
+            response_headers={"ResponseContentType": cache_format(namespace)[1]},
+        )
+    except Exception as e:
+        raise HTTPException(500, f"Error generating download URL: {e}")
+
+    record(namespace, "hits")
+    return {"download_url": download_url, "last_modified": last_modified}
+
+
+@router.post("/{namespace}/{key}/upload")
+async def create_cache_upload_url(namespace: str, key: str):
+    object_name = cache_object_name(namespace, key)
+
+    try:
+        upload_url = presigned_put_object(
+            bucket_name=settings.s3_bucket,
+            object_name=object_name,
+            expires=timedelta(minutes=15),
+            content_type=cache_format(namespace)[1],
+        )
+    except Exception as e:
+        raise HTTPException(500, f"Error generating presigned URL: {e}")
+
+    record(namespace, "uploads")
+    return {"upload_url": upload_url}
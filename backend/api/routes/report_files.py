@@ -16,16 +16,26 @@ from backend.api.db.models.report_file import (
     FileStatus,
 )
 from backend.api.s3_client import presigned_get_object, presigned_put_object
+from backend.api.source_dedup import link_or_publish_source
 
 router = APIRouter(prefix="/reports/{report_id}/files", tags=["report_files"])
 settings = get_settings()
 
 
+def content_type(file_type: FileType) -> str:
+    if file_type == FileType.txt:
+        return "text/plain"
+    if file_type == FileType.json:
+        return "application/json"
+    return "application/pdf"
+
+
 @router.post("/upload")
 async def create_presigned_upload_url(
     report_id: int,
     file_type: FileType,
     category: FileCategory,
+    resume: bool = False,
     session: AsyncSession = Depends(get_session),
 ):
     result = await session.execute(select(Report).where(Report.id == report_id))
@@ -43,17 +53,17 @@ async def create_presigned_upload_url(
 
     if existing_file:
         status = getattr(existing_file.status, "value", str(existing_file.status))
-        if status == FileStatus.error.value:
+        in_progress = status in (FileStatus.pending.value, FileStatus.processing.value)
+
+        # A worker retrying a redelivered job takes over the record its
+        # crashed or cancelled run left in progress.
+        if status == FileStatus.error.value or (resume and in_progress):
             try:
                 upload_url = presigned_put_object(
                     bucket_name=existing_file.s3_bucket or settings.s3_bucket,
                     object_name=existing_file.s3_key,
                     expires=timedelta(hours=1),
-                    content_type=(
-                        "text/plain"
-                        if existing_file.type == FileType.txt
-                        else "application/pdf"
-                    ),
+                    content_type=content_type(existing_file.type),
                 )
             except Exception as e:
                 raise HTTPException(500, f"Error generating presigned URL: {e}")
@@ -65,10 +75,14 @@ async def create_presigned_upload_url(
                 "file_type": existing_file.type,
                 "category": existing_file.category,
                 "status": existing_file.status,
-                "message": "Reused existing errored file for retry.",
+                "message": (
+                    "Resumed in-progress file for redelivered job."
+                    if in_progress
+                    else "Reused existing errored file for retry."
+                ),
             }
 
-        if status in (FileStatus.pending.value, FileStatus.processing.value):
+        if in_progress:
             raise HTTPException(409, f"File already in progress ({status}).")
         if status == FileStatus.done.value:
             raise HTTPException(400, "File already completed successfully.")
@@ -95,15 +109,7 @@ async def create_presigned_upload_url(
             bucket_name=settings.s3_bucket,
             object_name=s3_key,
             expires=timedelta(hours=1),
-            content_type=(
-                "text/plain"
-                if file_type == FileType.txt
-                else (
-                    "application/json"
-                    if file_type == FileType.json
-                    else "application/pdf"
-                )
-            ),
+            content_type=content_type(file_type),
         )
     except Exception as e:
         raise HTTPException(500, f"Error generating presigned URL: {e}")
@@ -150,17 +156,7 @@ async def get_download_url(
             bucket_name=file.s3_bucket or settings.s3_bucket,
             object_name=file.s3_key,
             expires=timedelta(hours=1),
-            response_headers={
-                "ResponseContentType": (
-                    "text/plain"
-                    if file.type == FileType.txt
-                    else (
-                        "application/json"
-                        if file.type == FileType.json
-                        else "application/pdf"
-                    )
-                )
-            },
+            response_headers={"ResponseContentType": content_type(file.type)},
         )
     except Exception as e:
         raise HTTPException(500, f"Error generating download URL: {e}")
@@ -203,7 +199,7 @@ async def update_file_status(
             "file_type": file.type,
         }
         if file.category == FileCategory.source:
-            background_tasks.add_task(publish_job, payload_data, "extractor")
+            background_tasks.add_task(link_or_publish_source, file.report_id, file.id)
         elif file.category == FileCategory.extract:
             background_tasks.add_task(publish_job, payload_data, "renderer")
 
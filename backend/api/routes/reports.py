@@ -6,6 +6,7 @@ from backend.api.db.session import get_session
 from backend.api.db.models.report import Report
 from backend.api.db.models.report_file import FileCategory, FileStatus
 from backend.api.rabbitmq import publish_job
+from backend.api.source_dedup import link_or_publish_source
 
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -104,8 +105,7 @@ async def retry_report_processing(
     out_status = status_val(output_file)
 
     if extract_file is None or ext_status == FileStatus.error.value:
-        payload = {"report_id": report.id, "file_id": source_file.id}
-        background_tasks.add_task(publish_job, payload, "extractor")
+        background_tasks.add_task(link_or_publish_source, report.id, source_file.id)
         return {
             "report_id": report.id,
             "retry_stage": "extractor",
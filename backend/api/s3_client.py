@@ -1,4 +1,5 @@
 import boto3
+import hashlib
 from datetime import timedelta
 from backend.api.config.settings import get_settings
 from botocore.exceptions import ClientError
@@ -56,3 +57,49 @@ def presigned_get_object(
         return url
     except ClientError as e:
         raise RuntimeError(f"Failed to generate presigned GET URL: {e}")
+
+
+def object_sha256(bucket_name: str, object_name: str) -> str:
+    s3 = get_s3_client()
+    try:
+        body = s3.get_object(Bucket=bucket_name, Key=object_name)["Body"]
+        digest = hashlib.sha256()
+        for chunk in body.iter_chunks(chunk_size=1024 * 1024):
+            digest.update(chunk)
+        return digest.hexdigest()
+    except ClientError as e:
+        raise RuntimeError(f"Failed to hash object {object_name}: {e}")
+
+
+def get_object_bytes(bucket_name: str, object_name: str) -> bytes:
+    s3 = get_s3_client()
+    try:
+        return s3.get_object(Bucket=bucket_name, Key=object_name)["Body"].read()
+    except ClientError as e:
+        raise RuntimeError(f"Failed to read object {object_name}: {e}")
+
+
+def put_object_bytes(
+    bucket_name: str,
+    object_name: str,
+    data: bytes,
+    content_type: str = "application/octet-stream",
+):
+    s3 = get_s3_client()
+    try:
+        s3.put_object(
+            Bucket=bucket_name, Key=object_name, Body=data, ContentType=content_type
+        )
+    except ClientError as e:
+        raise RuntimeError(f"Failed to write object {object_name}: {e}")
+
+
+def object_last_modified(bucket_name: str, object_name: str):
+    s3 = get_s3_client()
+    try:
+        return s3.head_object(Bucket=bucket_name, Key=object_name)["LastModified"]
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise RuntimeError(f"Failed to stat object {object_name}: {e}")
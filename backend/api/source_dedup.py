@@ -0,0 +1,148 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.config.settings import get_settings
+from backend.api.db.session import AsyncSessionLocal
+from backend.api.db.models.report import Report
+from backend.api.db.models.report_file import (
+    ReportFile,
+    FileType,
+    FileCategory,
+    FileStatus,
+)
+from backend.api.rabbitmq import publish_job
+from backend.api.s3_client import get_object_bytes, object_sha256, put_object_bytes
+
+
+settings = get_settings()
+
+
+async def _report_files(
+    session: AsyncSession, report_id: int
+) -> dict[FileCategory, ReportFile]:
+    result = await session.execute(
+        select(ReportFile).where(ReportFile.report_id == report_id)
+    )
+    return {f.category: f for f in result.scalars().all()}
+
+
+async def _find_donor(
+    session: AsyncSession, source: ReportFile
+) -> dict[FileCategory, ReportFile] | None:
+    result = await session.execute(
+        select(ReportFile)
+        .where(
+            ReportFile.sha256 == source.sha256,
+            ReportFile.category == FileCategory.source,
+            ReportFile.report_id != source.report_id,
+        )
+        .order_by(ReportFile.updated_at.desc())
+    )
+
+    for candidate in result.scalars().all():
+        files = await _report_files(session, candidate.report_id)
+        extract_file = files.get(FileCategory.extract)
+        if extract_file is not None and extract_file.status == FileStatus.done:
+            return files
+    return None
+
+
+def _restamp_report(data: bytes, company_name: str) -> bytes:
+    # The extract is the generated report, stamped with the donor's company
+    # name and date; the prompt sets both, so they are ours to overwrite.
+    report = json.loads(data)
+    meta = report.setdefault("report_meta", {})
+    meta["company_name"] = company_name
+    meta["report_date"] = datetime.now().strftime("%d %B, %Y")
+    return json.dumps(report, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+async def _link_extract(
+    session: AsyncSession,
+    report: Report,
+    donor: ReportFile,
+    existing: ReportFile | None,
+) -> ReportFile:
+    target = existing
+    if target is None:
+        target = ReportFile(
+            report_id=report.id,
+            type=donor.type,
+            category=donor.category,
+            s3_key=f"{donor.type.lower()}_{uuid.uuid4()}.{donor.type.value}",
+            s3_bucket=settings.s3_bucket,
+        )
+        session.add(target)
+
+    target.type = donor.type
+    target.s3_bucket = target.s3_bucket or settings.s3_bucket
+    data = await asyncio.to_thread(
+        get_object_bytes, donor.s3_bucket or settings.s3_bucket, donor.s3_key
+    )
+    await asyncio.to_thread(
+        put_object_bytes,
+        target.s3_bucket,
+        target.s3_key,
+        _restamp_report(data, str(report.company_name)),
+        "application/json",
+    )
+    target.status = FileStatus.done
+    target.error = None
+    await session.commit()
+    await session.refresh(target)
+    return target
+
+
+async def link_or_publish_source(report_id: int, file_id: int):
+    async with AsyncSessionLocal() as session:  # type: ignore[call-overload]
+        source = await session.get(ReportFile, file_id)
+        if source is None or source.report_id != report_id:
+            print(f"Source file {file_id} for report {report_id} not found")
+            return
+
+        extractor_payload = {
+            "report_id": report_id,
+            "file_id": source.id,
+            "file_type": source.type,
+        }
+
+        try:
+            source.sha256 = await asyncio.to_thread(
+                object_sha256, source.s3_bucket or settings.s3_bucket, source.s3_key
+            )
+            await session.commit()
+
+            donor = await _find_donor(session, source)
+            if donor is None:
+                await publish_job(extractor_payload, "extractor")
+                return
+
+            report = await session.get(Report, report_id)
+            if report is None:
+                raise ValueError(f"Report {report_id} not found")
+
+            own = await _report_files(session, report_id)
+            donor_extract = donor[FileCategory.extract]
+            extract_file = await _link_extract(
+                session, report, donor_extract, own.get(FileCategory.extract)
+            )
+            print(
+                f"Report {report_id}: reused extract of report "
+                f"{donor_extract.report_id} (sha256 {source.sha256[:12]})"
+            )
+        except Exception as e:
+            print(f"Source dedup failed for report {report_id}: {e}")
+            await session.rollback()
+            await publish_job(extractor_payload, "extractor")
+            return
+
+        # The donor's PDF shows its own name and date, so always re-render
+        renderer_payload = {
+            "report_id": report_id,
+            "file_id": extract_file.id,
+            "file_type": FileType.json,
+        }
+        await publish_job(renderer_payload, "renderer")
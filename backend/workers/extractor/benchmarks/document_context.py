@@ -0,0 +1,92 @@
+import argparse
+import statistics
+import time
+from typing import Callable
+
+import fitz  # PyMuPDF
+import pdfplumber
+from rich import print
+
+from backend.workers.extractor.utils.document_context import (
+    close_document_context,
+    get_document_context,
+)
+
+
+def _render(page: fitz.Page):
+    page.get_pixmap(matrix=fitz.Matrix(96 / 72.0, 96 / 72.0), alpha=False)
+
+
+def reopen_per_page(pdf_path: str, page_num: int, with_camelot: bool):
+    if with_camelot:
+        import camelot.io as camelot
+
+        camelot.read_pdf(pdf_path, pages=str(page_num), flavor="lattice")
+        camelot.read_pdf(pdf_path, pages=str(page_num), flavor="stream")
+
+    with pdfplumber.open(pdf_path) as pdf:
+        pdf.pages[page_num - 1].extract_text()
+
+    doc = fitz.open(pdf_path)
+    _render(doc.load_page(page_num - 1))
+    doc.close()
+
+
+def shared_context(pdf_path: str, page_num: int, with_camelot: bool):
+    ctx = get_document_context(pdf_path)
+    if with_camelot:
+        import camelot.io as camelot
+
+        page_pdf = ctx.single_page_pdf(page_num)
+        camelot.read_pdf(page_pdf, pages="1", flavor="lattice")
+        camelot.read_pdf(page_pdf, pages="1", flavor="stream")
+
+    ctx.plumber_page(page_num).extract_text()
+    _render(ctx.fitz_page(page_num))
+    ctx.release_page(page_num)
+
+
+def time_pages(
+    fn: Callable[[str, int, bool], None],
+    pdf_path: str,
+    pages: list[int],
+    with_camelot: bool,
+) -> list[float]:
+    timings = []
+    for page_num in pages:
+        start = time.perf_counter()
+        fn(pdf_path, page_num, with_camelot)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-page wall time: reopening the PDF vs a shared document context."
+    )
+    parser.add_argument("pdf_path")
+    parser.add_argument("--pages", type=int, default=0, help="0 = all pages")
+    parser.add_argument("--camelot", action="store_true", help="include camelot")
+    args = parser.parse_args()
+
+    with fitz.open(args.pdf_path) as doc:
+        total_pages = len(doc)
+    pages = list(range(1, (args.pages or total_pages) + 1))
+
+    baseline = time_pages(reopen_per_page, args.pdf_path, pages, args.camelot)
+    shared = time_pages(shared_context, args.pdf_path, pages, args.camelot)
+    close_document_context()
+
+    base_ms = statistics.mean(baseline) * 1000
+    shared_ms = statistics.mean(shared) * 1000
+    print(f"[cyan]Pages measured:[/cyan] {len(pages)} / {total_pages}")
+    print(f"reopen per page : {base_ms:8.1f} ms/page ({sum(baseline):.2f}s total)")
+    print(f"shared context  : {shared_ms:8.1f} ms/page ({sum(shared):.2f}s total)")
+    print(
+        f"[green]Per-page wall time reduced by {base_ms - shared_ms:.1f} ms "
+        f"({(1 - shared_ms / base_ms) * 100 if base_ms else 0:.0f}%)[/green]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,36 @@ class Settings(BaseSettings):
     api_base_url: str = Field(..., alias="API_BASE_URL")
 
     openai_api_key: str = Field(..., alias="OPENAI_API_KEY")
+    vision_concurrency: int = Field(4, alias="VISION_CONCURRENCY")
+    vision_rpm: int = Field(500, alias="VISION_RPM")
+    vision_tpm: int = Field(200_000, alias="VISION_TPM")
+    vision_cache_enabled: bool = Field(True, alias="VISION_CACHE_ENABLED")
+    vision_cache_dir: str = Field(".cache/vision", alias="VISION_CACHE_DIR")
+    vision_cache_max_entries: int = Field(5000, alias="VISION_CACHE_MAX_ENTRIES")
+    vision_cache_max_mb: int = Field(200, alias="VISION_CACHE_MAX_MB")
+
+    context_token_budget: int = Field(60_000, alias="CONTEXT_TOKEN_BUDGET")
+    report_generation_mode: str = Field("single", alias="REPORT_GENERATION_MODE")
+    section_top_pages: int = Field(12, alias="SECTION_TOP_PAGES")
+    section_token_budget: int = Field(12_000, alias="SECTION_TOKEN_BUDGET")
+
+    report_cache_backend: str = Field("disk", alias="REPORT_CACHE_BACKEND")
+    report_cache_dir: str = Field(".cache/reports", alias="REPORT_CACHE_DIR")
+    report_cache_ttl_hours: int = Field(168, alias="REPORT_CACHE_TTL_HOURS")
+    report_cache_max_entries: int = Field(1000, alias="REPORT_CACHE_MAX_ENTRIES")
+    report_cache_max_mb: int = Field(100, alias="REPORT_CACHE_MAX_MB")
+    report_cache_bypass: bool = Field(False, alias="REPORT_CACHE_BYPASS")
+
+    max_concurrent_jobs: int = Field(2, alias="MAX_CONCURRENT_JOBS")
+    shutdown_grace_seconds: int = Field(60, alias="SHUTDOWN_GRACE_SECONDS")
 
     max_workers: int = Field(2, alias="MAX_WORKERS")
+    max_page_chunk: int = Field(8, alias="MAX_PAGE_CHUNK")
+    ocr_batch_size: int = Field(8, alias="OCR_BATCH_SIZE")
+    ocr_threads: int = Field(0, alias="OCR_THREADS")
+    table_engine: str = Field("pymupdf", alias="TABLE_ENGINE")
+    page_triage: bool = Field(True, alias="PAGE_TRIAGE")
+    txt_chunk_tokens: int = Field(800, alias="TXT_CHUNK_TOKENS")
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
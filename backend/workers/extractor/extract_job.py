@@ -1,13 +1,12 @@
 import asyncio
 import multiprocessing as mp
 import shutil
-import os
-import json
+import uuid
 from pathlib import Path
 from typing import Optional
 
 from backend.api.db.models.report_file import FileType
-from backend.workers.extractor.utils.process_pdf import process_pdf
+from backend.workers.extractor.utils.process_pdf import stream_pdf
 from backend.workers.extractor.utils.report_formatter import generate_report
 from backend.workers.extractor.config.settings import get_settings
 from backend.workers.extractor.utils.api import (
@@ -20,9 +19,12 @@ from backend.workers.extractor.utils.api import (
     FileCategory,
     FileStatus,
 )
-from backend.workers.extractor.utils.openai_vision import extract_charts_batch
-from backend.workers.extractor.utils.render_page import preprocess_for_vision
-from backend.workers.extractor.utils.text_extractor import extract_text_from_txt
+from backend.workers.extractor.utils.openai_vision import (
+    VisionBatcher,
+    get_vision_cache,
+)
+from backend.workers.extractor.utils.jsonl import write_jsonl
+from backend.workers.extractor.utils.text_extractor import iter_txt_chunks
 
 
 mp.set_start_method("spawn", force=True)
@@ -30,19 +32,26 @@ mp.set_start_method("spawn", force=True)
 MAX_IMAGES_PER_BATCH = 5
 
 
-async def extract_job(report_id: int, source_file_id: int, source_file_type: FileType):
+async def extract_job(
+    report_id: int,
+    source_file_id: int,
+    source_file_type: FileType,
+    resume: bool = False,
+):
     print(f"Starting extractor for report {report_id}, source file {source_file_id}")
 
     settings = get_settings()
-    tmp_root = Path("tmp")
+    # Jobs run concurrently, so each gets its own scratch directory.
+    tmp_root = Path("tmp") / f"extract_{report_id}_{uuid.uuid4().hex[:8]}"
     downloads_dir = tmp_root / "downloads"
     output_dir = tmp_root / "output"
     downloads_dir.mkdir(parents=True, exist_ok=True)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    json_path = output_dir / f"report_{report_id}_extract.json"
+    json_path = output_dir / f"report_{report_id}_extract.jsonl"
 
     extract_file_id: Optional[int] = None
+    vision: Optional[VisionBatcher] = None
 
     try:
         upload_info = await create_presigned_upload(
@@ -50,6 +59,7 @@ async def extract_job(report_id: int, source_file_id: int, source_file_type: Fil
             report_id,
             FileType.json,
             FileCategory.extract,
+            resume=resume,
         )
         extract_file_id = upload_info["file_id"]
 
@@ -75,52 +85,59 @@ async def extract_job(report_id: int, source_file_id: int, source_file_type: Fil
         print(f"Starting extraction for: {file_path} ({source_file_type})")
 
         if source_file_type == FileType.txt:
-            data = extract_text_from_txt(str(file_path))
+            # Chunks go straight from the reader to disk; the file is never
+            # held in memory as a whole.
+            page_count = await asyncio.to_thread(
+                write_jsonl,
+                iter_txt_chunks(str(file_path), settings.txt_chunk_tokens),
+                json_path,
+            )
         elif source_file_type == FileType.pdf:
-            data = process_pdf(str(file_path), max_workers=settings.max_workers)
+            # Vision batches are dispatched as soon as enough flagged pages
+            # arrive, so network-bound vision overlaps with CPU extraction.
+            vision = VisionBatcher(
+                concurrency=settings.vision_concurrency,
+                max_images=MAX_IMAGES_PER_BATCH,
+                cache=get_vision_cache() if settings.vision_cache_enabled else None,
+            )
+            data = []
+            async for page in stream_pdf(
+                str(file_path),
+                max_workers=settings.max_workers,
+                max_chunk_size=settings.max_page_chunk,
+                ocr_batch_size=settings.ocr_batch_size,
+                table_engine=settings.table_engine,
+                triage=settings.page_triage,
+            ):
+                data.append(page)
+                if page.get("needs_vision"):
+                    vision.add(page)
+            data.sort(key=lambda p: p["page"])
+
+            batch_count = await vision.drain()
+            print(f"Vision batches analyzed: {batch_count}")
+            if vision.cache is not None:
+                print(f"Vision cache: {vision.cache.stats.summary()}")
+
+            for page in data:
+                page.pop("vision_image", None)
+                page.pop("vision_phash", None)
+
+            page_count = await asyncio.to_thread(write_jsonl, data, json_path)
         else:
             raise ValueError(f"Unsupported file type: {source_file_type}")
 
-        if not data:
+        if not page_count:
             raise ValueError(
                 f"No extractable content found in {source_file_type.upper()} file"
             )
-
-        compressed_pages = []
-        for page in [p for p in data if p.get("needs_vision")]:
-            compressed_path = preprocess_for_vision(page["img_path"])
-            page["compressed_path"] = compressed_path
-            sz = os.path.getsize(compressed_path)
-            compressed_pages.append((page, sz))
-
-        batches, batch, current_bytes = [], [], 0
-        for page, sz in compressed_pages:
-            if len(batch) >= MAX_IMAGES_PER_BATCH or current_bytes + sz > 900_000:
-                batches.append(batch)
-                batch, current_bytes = [], 0
-            batch.append(page)
-            current_bytes += sz
-        if batch:
-            batches.append(batch)
-
-        print(f"Vision batches prepared: {len(batches)}")
-        for idx, batch in enumerate(batches, 1):
-            paths = [p["compressed_path"] for p in batch]
-            print(f"Analyzing batch {idx}/{len(batches)} ({len(paths)} pages)...")
-            try:
-                res = extract_charts_batch(paths)
-                for p, r in zip(batch, res):
-                    p["chart_json"] = r
-            except Exception as e:
-                print(f"Vision batch {idx} failed: {e}")
-
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Saved extracted data to {json_path}")
+        print(f"Saved {page_count} extracted pages to {json_path}")
 
         print("Generating report artifact...")
-        report_path = await asyncio.to_thread(
-            generate_report, str(json_path), company_name=report["company_name"]
+        report_path = await generate_report(
+            str(json_path),
+            company_name=report["company_name"],
+            output_dir=str(output_dir),
         )
         print(f"Report artifact at {report_path}")
 
@@ -138,6 +155,8 @@ async def extract_job(report_id: int, source_file_id: int, source_file_type: Fil
     except Exception as e:
         err_msg = str(e)
         print(f"Extractor failed for report {report_id}: {err_msg}")
+        if vision is not None:
+            vision.cancel()
 
         if extract_file_id is not None:
             try:
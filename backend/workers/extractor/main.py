@@ -1,13 +1,20 @@
 import asyncio
 import aio_pika
+from backend.workers.scheduler import JobScheduler
 from backend.workers.extractor.config.settings import get_settings
 from backend.workers.extractor.process_message import process_message
+from backend.workers.extractor.utils.page_pool import (
+    start_page_pool,
+    shutdown_page_pool,
+)
 
 
 async def main():
     print("extractor worker starting...")
     settings = get_settings()
 
+    await asyncio.to_thread(start_page_pool, settings.max_workers, settings.ocr_threads)
+
     connection = await aio_pika.connect_robust(
         settings.rabbitmq_url,
         timeout=15,
@@ -15,9 +22,11 @@ async def main():
         reconnect_interval=5,
     )
 
+    scheduler = JobScheduler(process_message, settings.max_concurrent_jobs)
+
     async with connection:
         channel = await connection.channel()
-        await channel.set_qos(prefetch_count=1)
+        await channel.set_qos(prefetch_count=settings.max_concurrent_jobs)
 
         exchange = await channel.declare_exchange(
             settings.rabbitmq_exchange, aio_pika.ExchangeType.DIRECT, durable=True
@@ -26,13 +35,23 @@ async def main():
         queue = await channel.declare_queue("extractor", durable=True)
         await queue.bind(exchange, routing_key="extractor")
 
-        await queue.consume(process_message, no_ack=False)
-        print("Listening on 'extractor' queue...")
+        consumer_tag = await queue.consume(scheduler.submit, no_ack=False)
+        print(
+            f"Listening on 'extractor' queue "
+            f"(max {settings.max_concurrent_jobs} concurrent jobs)..."
+        )
 
         try:
             await asyncio.Future()
         except asyncio.CancelledError:
             print("Graceful shutdown requested.")
+        finally:
+            try:
+                await queue.cancel(consumer_tag)
+            except Exception as e:
+                print(f"Failed to cancel consumer: {e}")
+            await scheduler.drain(settings.shutdown_grace_seconds)
+            shutdown_page_pool()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from backend.workers.extractor.config.settings import get_settings
 
 settings = get_settings()
 openai_client = OpenAI(api_key=settings.openai_api_key)
+async_openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
@@ -1,5 +1,4 @@
 from aio_pika.abc import AbstractIncomingMessage
-import asyncio
 import json
 from backend.api.db.models.report_file import FileType
 from backend.workers.extractor.extract_job import extract_job
@@ -9,25 +8,22 @@ async def process_message(message: AbstractIncomingMessage) -> None:
     try:
         payload = json.loads(message.body)
         print(f"Received message: {payload}")
+        report_id = payload["report_id"]
+        file_id = payload["file_id"]
+        file_type = FileType(payload.get("file_type", "pdf"))
+    except Exception as e:
+        # A malformed payload will never succeed; drop it instead of looping.
+        print(f"Rejecting unprocessable message: {e}")
+        await message.reject(requeue=False)
+        return
 
-        await message.ack()
-
-        async def _run():
-            try:
-                payload = json.loads(message.body)
-                report_id = payload["report_id"]
-                file_id = payload["file_id"]
-                file_type = FileType(payload.get("file_type", "pdf"))
-                await extract_job(report_id, file_id, file_type)
-                print(f"Successfully processed {payload}")
-            except Exception as e:
-                print(f"Error in extract_job: {e}")
-
-        asyncio.create_task(_run())
+    # A redelivered message belongs to a run that crashed or was cancelled;
+    # the job takes over the extract record that run left in progress.
+    if message.redelivered:
+        print(f"Message for report {report_id} was redelivered; resuming job")
 
-    except Exception as e:
-        print(f"Error processing message: {e}")
-        try:
-            await message.ack()
-        except Exception as ack_err:
-            print(f"Failed to ack message after error: {ack_err}")
+    # extract_job records its own failures on the extract file, so reaching
+    # this point means the job is finished one way or another.
+    await extract_job(report_id, file_id, file_type, resume=message.redelivered)
+    await message.ack()
+    print(f"Successfully processed {payload}")
@@ -59,11 +59,13 @@ async def create_presigned_upload(
     report_id: int,
     file_type: FileType,
     category: FileCategory,
+    resume: bool = False,
 ) -> dict[str, Any]:
     url = f"{api_base_url}/reports/{report_id}/files/upload"
     params = {
         "file_type": file_type.value,
         "category": category.value,
+        "resume": "true" if resume else "false",
     }
 
     async with aiohttp.ClientSession() as session:
@@ -112,3 +114,34 @@ async def update_file_status(
                     f"Failed to update file status: {resp.status} - {text}"
                 )
             print(f"File {file_id} → {status.value}")
+
+
+async def fetch_cache_download(
+    api_base_url: str, namespace: str, key: str, max_age: int | None = None
+) -> str | None:
+    url = f"{api_base_url}/cache/{namespace}/{key}"
+    params = {"max_age": max_age} if max_age is not None else {}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, params=params) as resp:
+            if resp.status == 404:
+                return None
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(
+                    f"Failed to look up cache entry: {resp.status} - {text}"
+                )
+            data = await resp.json()
+            return data.get("download_url")
+
+
+async def create_cache_upload(api_base_url: str, namespace: str, key: str) -> str:
+    url = f"{api_base_url}/cache/{namespace}/{key}/upload"
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(
+                    f"Failed to create cache upload URL: {resp.status} - {text}"
+                )
+            data = await resp.json()
+            return data["upload_url"]
@@ -1,23 +1,23 @@
-from typing import cast
+from pathlib import Path
+from typing import Optional
 import cv2
+import numpy as np
 from rich import print
-from backend.workers.extractor.utils.ocr_manager import load_easyocr
+from backend.workers.extractor.utils.ocr_manager import run_ocr
+from backend.workers.extractor.utils.render_page import PageImage
 
 
-def visual_score(image_path: str):
-    import cv2, numpy as np
-
-    img = cv2.imread(image_path)
-    if img is None:
+def visual_score(image: PageImage):
+    gray = image.pixels
+    if gray.size == 0:
         return 0.0
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     edges = cv2.Canny(gray, 50, 150)
 
     edge_density = np.sum(edges > 0) / edges.size
 
-    img_small = cv2.resize(img, (64, 64))
-    data: np.ndarray = img_small.reshape((-1, 3)).astype(np.float32)
+    img_small = cv2.resize(gray, (64, 64))
+    data: np.ndarray = img_small.reshape((-1, 1)).astype(np.float32)
 
     K = 5
     criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
@@ -49,12 +49,9 @@ def visual_score(image_path: str):
     return float(min(score, 1.0))
 
 
-def caption_score(image_path: str) -> float:
-    reader = load_easyocr()
+def caption_score(image: PageImage) -> float:
     try:
-        result = reader.readtext(image_path, detail=0)
-        text_list = cast(list[str], result)
-        text = " ".join(text_list).lower()
+        text = run_ocr(image)["text"].lower()
     except Exception:
         return 0.0
 
@@ -73,16 +70,13 @@ def caption_score(image_path: str) -> float:
     return float(min(hits / 3.0, 1.0))
 
 
-def analyze_page(image_path: str, visualize: bool = False) -> dict:
-    v_score = visual_score(image_path)
-    c_score = caption_score(image_path)
+def analyze_page(image: PageImage, visualize: bool = False) -> dict:
+    v_score = visual_score(image)
+    c_score = caption_score(image)
     combined = 0.7 * v_score + 0.3 * c_score
 
-    reader = load_easyocr()
     try:
-        text_blocks = reader.readtext(image_path, detail=0)
-        text_blocks = cast(list[str], text_blocks)
-        text_str = " ".join(text_blocks).lower()
+        text_str = run_ocr(image)["text"].lower()
         word_count = len(text_str.split())
     except Exception:
         word_count = 0
@@ -110,10 +104,10 @@ def analyze_page(image_path: str, visualize: bool = False) -> dict:
     )
 
     if visualize:
-        img = cv2.imread(image_path)
-        h, w = img.shape[:2]  # type: ignore
-        cv2.putText(  # type: ignore
-            img,  # type: ignore
+        img = cv2.cvtColor(image.pixels, cv2.COLOR_GRAY2BGR)
+        h = img.shape[0]
+        cv2.putText(
+            img,
             f"{label} ({combined:.2f})",
             (30, h - 40),
             cv2.FONT_HERSHEY_SIMPLEX,
@@ -121,8 +115,9 @@ def analyze_page(image_path: str, visualize: bool = False) -> dict:
             (0, 255, 0),
             2,
         )
-        vis_path = image_path.replace(".png", "_analyzed.png")
-        cv2.imwrite(vis_path, img)  # type: ignore
+        vis_path = Path("tmp/output/pages") / f"{image.name}_analyzed.png"
+        vis_path.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(vis_path), img)
         print(f"[dim]Visualization saved to {vis_path}[/dim]")
 
     return {
@@ -133,11 +128,10 @@ def analyze_page(image_path: str, visualize: bool = False) -> dict:
     }
 
 
-def extract_chart_region(image_path: str, min_area_ratio: float = 0.1):
-    import cv2, numpy as np, os
-
-    img = cv2.imread(image_path)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)  # type: ignore
+def extract_chart_region(
+    image: PageImage, min_area_ratio: float = 0.1
+) -> Optional[PageImage]:
+    gray = image.pixels
     edges = cv2.Canny(gray, 80, 200)
 
     contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -150,8 +144,4 @@ def extract_chart_region(image_path: str, min_area_ratio: float = 0.1):
         return None
 
     x, y, cw, ch = max(candidates, key=lambda r: r[2] * r[3])
-    crop = img[y : y + ch, x : x + cw]  # type: ignore
-
-    crop_path = os.path.splitext(image_path)[0] + "_chart_crop.png"
-    cv2.imwrite(crop_path, crop)
-    return crop_path
+    return PageImage(gray[y : y + ch, x : x + cw], f"{image.name}_chart_crop")
@@ -1,8 +1,24 @@
+import heapq
 import json
 import re
-import pandas as pd
-from typing import List, Dict, Any
+import zlib
+import numpy as np
+from typing import Iterable, List, Dict, Any, Optional
 from collections import Counter
+from rich import print
+from backend.workers.extractor.utils.prompt_builder import SECTION_QUERIES
+from backend.workers.extractor.utils.retrieval import PageIndex
+from backend.workers.extractor.utils.token_counter import count_tokens
+
+
+FINANCIAL_KEYWORDS = re.compile(
+    r"\b(?:FY\s?'?\d{2,4}|Q[1-4]|H[12]|9M|YoY|QoQ|CAGR|revenue|EBITDA|PAT|"
+    r"margin|EPS|ROE|ROCE|crore|lakh|cr|mn|bn|guidance|outlook|valuation|"
+    r"shareholding|promoter|dividend|capex|order\s?book)\b",
+    re.IGNORECASE,
+)
+NUMBER_PATTERN = re.compile(r"[-+(]?\d[\d,]*(?:\.\d+)?%?")
+REPORT_QUERY = " ".join(SECTION_QUERIES.values())
 
 
 def normalize_text(text: str) -> str:
@@ -11,78 +27,344 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
-def serialize_table(path: str) -> Dict[str, Any] | None:
-    try:
-        df = pd.read_csv(path)
-        if df.empty or df.shape[1] < 2:
-            return None
+def serialize_table(table_info: Dict[str, Any]) -> Dict[str, Any] | None:
+    columns = table_info.get("columns")
+    if not columns or len(columns) < 2:
+        return None
 
-        df = df.fillna("").astype(str)
+    headers = [str(h).strip() for h in table_info.get("headers", [])]
+    rows = [[str(cell).strip() for cell in row] for row in zip(*columns)]
+    if not rows:
+        return None
 
-        headers = [str(h).strip() for h in df.columns.tolist()]
+    if len(rows) > 20:
+        return {
+            "format": "compact",
+            "headers": headers,
+            "rows": rows,
+            "row_count": len(rows),
+        }
+    return {
+        "format": "records",
+        "data": [dict(zip(headers, row)) for row in rows],
+    }
 
-        if len(df) > 20:
-            rows = [[str(cell).strip() for cell in row] for row in df.values.tolist()]
-            return {
-                "format": "compact",
-                "headers": headers,
-                "rows": rows,
-                "row_count": len(rows),
-            }
-        else:
-            records = df.to_dict("records")
-            return {
-                "format": "records",
-                "data": [
-                    {str(k).strip(): str(v).strip() for k, v in rec.items()}
-                    for rec in records
-                ],
-            }
-    except Exception as e:
-        print(f"Failed to serialize table {path}: {e}")
-        return None
 
+BLOCK_SPLIT = re.compile(r"(\n+|(?<=[.!?])\s+(?=[A-Z0-9(\"']))")
+WORD_PATTERN = re.compile(r"\w+")
 
-def deduplicate_intelligently(
-    text: str, seen_texts: Dict[str, int], threshold: int = 50
-) -> str:
-    if not text or len(text) < threshold:
-        return text
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+_MINHASH_RNG = np.random.default_rng(20240601)
+# multiply-shift hashing: odd multipliers, wrap-around uint64 arithmetic
+_MINHASH_A = _MINHASH_RNG.integers(1, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64) | 1
+_MINHASH_B = _MINHASH_RNG.integers(0, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64)
 
-    text_key = text[:100]
-    seen_texts[text_key] = seen_texts.get(text_key, 0) + 1
 
-    if seen_texts[text_key] >= 3 and len(text) > 200:
-        preview = " ".join(text.split()[:8]) + "..."
-        return f"[REPEATED: {preview}]"
+def split_blocks(text: str) -> tuple[List[str], List[str]]:
+    parts = BLOCK_SPLIT.split(text)
+    return parts[0::2], parts[1::2]
 
-    return text
 
+def shingle_hashes(block: str, size: int = 3) -> Optional[np.ndarray]:
+    words = WORD_PATTERN.findall(block.lower())
+    numeric = sum(1 for w in words if w.isdigit())
+    if len(words) < 6 or numeric / len(words) > 0.3:
+        # too short to be boilerplate, or a line of figures that must survive
+        return None
 
-def llm_friendly_compress(parsed_data: List[Dict[str, Any]]) -> str:
-    seen_texts = {}
+    # page numbers and dates are what make running footers differ
+    words = ["#" if w.isdigit() else w for w in words]
+    shingles = {
+        " ".join(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))
+    }
+    return np.fromiter(
+        (zlib.crc32(sh.encode("utf-8")) for sh in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+def same_figures(a: str, b: str) -> bool:
+    # Shingles ignore digits, so check the numbers themselves: amounts,
+    # percentages and decimals must match and at most one bare integer (a page
+    # number or day) may differ, otherwise real figures would be folded away.
+    nums_a, nums_b = NUMBER_PATTERN.findall(a), NUMBER_PATTERN.findall(b)
+    if len(nums_a) != len(nums_b):
+        return False
+
+    differing = 0
+    for x, y in zip(nums_a, nums_b):
+        if x == y:
+            continue
+        if not (x.isdigit() and y.isdigit()):
+            return False
+        differing += 1
+    return differing <= 1
+
+
+def minhash_signature(hashes: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        permuted = hashes[:, None] * _MINHASH_A[None, :] + _MINHASH_B[None, :]
+    return (permuted >> np.uint64(32)).min(axis=0)
+
+
+def find_near_duplicates(
+    blocks: List[tuple[Any, str]], threshold: float = 0.8, min_pages: int = 3
+) -> Dict[int, int]:
+    signatures: Dict[int, np.ndarray] = {}
+    for idx, (_, block) in enumerate(blocks):
+        hashes = shingle_hashes(block)
+        if hashes is not None:
+            signatures[idx] = minhash_signature(hashes)
+
+    parent = {idx: idx for idx in signatures}
+
+    def find(idx: int) -> int:
+        while parent[idx] != idx:
+            parent[idx] = parent[parent[idx]]
+            idx = parent[idx]
+        return idx
+
+    # Each bucket is compared against its first member only, which keeps the
+    # pass linear even when a footer lands in the same bucket on every page.
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    buckets: Dict[tuple[int, bytes], int] = {}
+    for idx, sig in signatures.items():
+        for band in range(LSH_BANDS):
+            bucket = (band, sig[band * rows : (band + 1) * rows].tobytes())
+            head = buckets.setdefault(bucket, idx)
+            if head == idx or find(head) == find(idx):
+                continue
+            if np.mean(signatures[head] == sig) >= threshold:
+                parent[find(idx)] = find(head)
+
+    clusters: Dict[int, List[int]] = {}
+    for idx in signatures:
+        clusters.setdefault(find(idx), []).append(idx)
+
+    duplicates: Dict[int, int] = {}
+    for members in clusters.values():
+        canonical = min(members)
+        members = [
+            idx for idx in members if same_figures(blocks[canonical][1], blocks[idx][1])
+        ]
+        if len({blocks[idx][0] for idx in members}) < min_pages:
+            continue
+        for idx in members:
+            duplicates[idx] = canonical
+    return duplicates
+
+
+def deduplicate_blocks(
+    sources: List[tuple[Any, str]],
+) -> tuple[List[str], Dict[str, str]]:
+    split_sources = [split_blocks(text) for _, text in sources]
+    blocks = [
+        (page, block)
+        for (page, _), (parts, _) in zip(sources, split_sources)
+        for block in parts
+    ]
+    duplicates = find_near_duplicates(blocks)
+
+    labels: Dict[int, str] = {}
+    repeated_content: Dict[str, str] = {}
+    for canonical in sorted(set(duplicates.values())):
+        label = f"R{len(labels) + 1}"
+        labels[canonical] = label
+        repeated_content[label] = blocks[canonical][1].strip()
+
+    texts = []
+    offset = 0
+    for parts, separators in split_sources:
+        out: List[str] = []
+        last_marker = None
+        for i, block in enumerate(parts):
+            canonical = duplicates.get(offset + i)
+            if canonical is None:
+                piece, last_marker = block, None
+            else:
+                marker = f"[REPEATED: {labels[canonical]}]"
+                if marker == last_marker:
+                    continue
+                piece, last_marker = marker, marker
+            if out:
+                out.append(separators[i - 1])
+            out.append(piece)
+        texts.append(normalize_text("".join(out)))
+        offset += len(parts)
+
+    return texts, repeated_content
+
+
+def financial_signal(page_obj: Dict[str, Any]) -> float:
+    body = " ".join(
+        [page_obj.get("text", ""), page_obj.get("ocr", "")]
+        + [json.dumps(t, ensure_ascii=False) for t in page_obj.get("tables", [])]
+    )
+    words = body.split()
+    if not words and not page_obj.get("charts"):
+        return 0.0
+
+    numeric_ratio = (
+        sum(1 for w in words if NUMBER_PATTERN.fullmatch(w)) / len(words)
+        if words
+        else 0.0
+    )
+    keyword_hits = len(FINANCIAL_KEYWORDS.findall(body))
+
+    return (
+        3.0 * len(page_obj.get("tables", []))
+        + 3.0 * len(page_obj.get("charts", []))
+        + 10.0 * numeric_ratio
+        + min(keyword_hits, 20) * 0.5
+    )
+
+
+def _compact(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def preselect_pages(
+    pages: Iterable[Dict[str, Any]],
+    token_budget: int,
+    model: str = "gpt-4o-mini",
+) -> List[Dict[str, Any]]:
+    # Single streaming pass that keeps only the densest pages fitting in the
+    # budget, so huge inputs never have to be held in memory at once.
+    heap: List[tuple[float, int, int, Dict[str, Any]]] = []
+    total_tokens = dropped_pages = 0
+    for seq, page in enumerate(pages):
+        tokens = count_tokens(_compact(page), model)
+        signal = financial_signal(
+            {
+                "text": page.get("text") or "",
+                "ocr": page.get("ocr_text") or page.get("ocr") or "",
+                "tables": page.get("tables") or page.get("table_infos") or [],
+                "charts": [page["chart_json"]] if page.get("chart_json") else [],
+            }
+        )
+        heapq.heappush(heap, (signal / max(tokens, 200), seq, tokens, page))
+        total_tokens += tokens
+        while total_tokens > token_budget and heap:
+            _, _, evicted_tokens, _ = heapq.heappop(heap)
+            total_tokens -= evicted_tokens
+            dropped_pages += 1
+
+    if dropped_pages:
+        print(f"[cyan]Preselection:[/cyan] dropped {dropped_pages} low-signal pages")
+    return [page for _, _, _, page in sorted(heap, key=lambda entry: entry[1])]
+
+
+def page_ranges(pages: List[Any]) -> str:
+    # "3-7,9" costs a few tokens where a 300-entry list costs hundreds
+    numbers = sorted({p for p in pages if isinstance(p, int)})
+    spans: List[str] = []
+    for n in numbers:
+        if spans and n == end + 1:
+            end = n
+            spans[-1] = f"{start}-{end}" if end > start else str(start)
+            continue
+        start = end = n
+        spans.append(str(n))
+    spans += sorted({str(p) for p in pages if not isinstance(p, int)})
+    return ",".join(spans)
+
+
+def budgeted_compress(
+    page_objs: List[Dict[str, Any]],
+    repeated_content: Dict[str, str],
+    token_budget: int,
+    model: str = "gpt-4o-mini",
+) -> str:
+    def page_order(n: Any) -> int:
+        return n if isinstance(n, int) else 0
+
+    def build_context(
+        kept: List[Dict[str, Any]], omitted: List[Any], list_omitted: bool = True
+    ) -> str:
+        context_obj: Dict[str, Any] = {
+            "document": sorted(kept, key=lambda p: page_order(p["page_number"]))
+        }
+        # [REPEATED: Rn] markers only occur in kept pages
+        if repeated_content and (kept or not omitted):
+            context_obj["repeated_content_reference"] = repeated_content
+        if omitted and list_omitted:
+            context_obj["omitted_pages"] = page_ranges(omitted)
+        return _compact(context_obj)
+
+    # The wrapper and the reference block are paid for whatever is kept
+    remaining = token_budget - count_tokens(build_context([], []), model)
+
+    serialized = [_compact(page_obj) for page_obj in page_objs]
+    # BM25 relevance to what the report actually asks for, scaled to 0..1
+    relevance = PageIndex(serialized).scores(REPORT_QUERY)
+    if len(relevance) and relevance.max() > 0:
+        relevance = relevance / relevance.max()
+
+    ranked = []
+    for page_obj, page_json, rel in zip(page_objs, serialized, relevance):
+        tokens = count_tokens(page_json, model) + 1
+        # Density, floored so near-empty pages with one keyword don't jump ahead
+        density = (financial_signal(page_obj) + 5.0 * rel) / max(tokens, 200)
+        ranked.append((density, tokens, page_obj))
+    ranked.sort(key=lambda r: r[0], reverse=True)
+
+    kept, omitted = [], []
+    dropped = 0
+    for _, tokens, page_obj in ranked:
+        if tokens <= remaining:
+            kept.append((tokens, page_obj))
+            remaining -= tokens
+        else:
+            omitted.append(page_obj["page_number"])
+            dropped += tokens
+
+    # The omitted list costs tokens too; give back the lowest-ranked pages
+    # until the whole context fits.
+    context = build_context([p for _, p in kept], omitted)
+    used_tokens = count_tokens(context, model)
+    while used_tokens > token_budget and kept:
+        tokens, page_obj = kept.pop()
+        omitted.append(page_obj["page_number"])
+        dropped += tokens
+        context = build_context([p for _, p in kept], omitted)
+        used_tokens = count_tokens(context, model)
+    if used_tokens > token_budget:
+        context = build_context([], omitted, list_omitted=False)
+        used_tokens = count_tokens(context, model)
+
+    print(
+        f"[cyan]Context:[/cyan] {used_tokens}/{token_budget} tokens, "
+        f"{len(kept)} pages kept, {len(omitted)} dropped (~{dropped} tokens)"
+    )
+    return context
+
+
+def llm_friendly_compress(
+    parsed_data: List[Dict[str, Any]],
+    token_budget: Optional[int] = None,
+    model: str = "gpt-4o-mini",
+) -> str:
     compressed_pages = []
-    repeated_content = {}
 
+    sources = []
     for page in parsed_data:
         page_num = page.get("page", "?")
-        text = normalize_text(page.get("text", ""))
-        ocr = normalize_text(page.get("ocr_text") or page.get("ocr") or "")
-
-        text_dedupe = deduplicate_intelligently(text, seen_texts)
-        ocr_dedupe = deduplicate_intelligently(ocr, seen_texts)
+        sources.append((page_num, normalize_text(page.get("text", ""))))
+        sources.append(
+            (page_num, normalize_text(page.get("ocr_text") or page.get("ocr") or ""))
+        )
+    deduped, repeated_content = deduplicate_blocks(sources)
 
-        if "[REPEATED:" in text_dedupe and text not in repeated_content.values():
-            key = text_dedupe.split("[REPEATED: ")[1].split("]")[0]
-            repeated_content[key] = text
-        if "[REPEATED:" in ocr_dedupe and ocr not in repeated_content.values():
-            key = ocr_dedupe.split("[REPEATED: ")[1].split("]")[0]
-            repeated_content[key] = ocr
+    for i, page in enumerate(parsed_data):
+        page_num = page.get("page", "?")
+        text_dedupe, ocr_dedupe = deduped[2 * i], deduped[2 * i + 1]
 
         tables_field = page.get("tables") or page.get("table_infos") or []
         tables = []
         for table_info in tables_field:
-            tbl = serialize_table(table_info.get("path", ""))
+            tbl = serialize_table(table_info)
             if tbl:
                 tables.append(tbl)
 
@@ -120,6 +402,11 @@ def llm_friendly_compress(parsed_data: List[Dict[str, Any]]) -> str:
 
         compressed_pages.append(page_obj)
 
+    if token_budget:
+        return budgeted_compress(
+            compressed_pages, repeated_content, token_budget, model
+        )
+
     context_obj: Dict[str, Any] = {"document": compressed_pages}
 
     if repeated_content:
@@ -155,7 +442,7 @@ def ultra_compact_compress(parsed_data: List[Dict[str, Any]]) -> str:
         if tables_field:
             tables = []
             for tbl_info in tables_field:
-                tbl = serialize_table(tbl_info.get("path", ""))
+                tbl = serialize_table(tbl_info)
                 if tbl:
                     tables.append(tbl)
             if tables:
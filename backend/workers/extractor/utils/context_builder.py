@@ -1,8 +1,19 @@
 import json
-import pandas as pd
 from typing import List, Dict, Any
 
 
+def markdown_table(headers: List[str], rows: List[List[Any]]) -> str:
+    def cell(value: Any) -> str:
+        return ("" if value is None else str(value)).replace("|", "\\|").strip()
+
+    lines = [
+        "| " + " | ".join(cell(h) for h in headers) + " |",
+        "|" + "|".join("---" for _ in headers) + "|",
+    ]
+    lines += ["| " + " | ".join(cell(v) for v in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
 def build_context(parsed_data: List[Dict[str, Any]]) -> str:
     table_blocks = []
     text_blocks = []
@@ -18,12 +29,12 @@ def build_context(parsed_data: List[Dict[str, Any]]) -> str:
         table_field = page.get("tables") or page.get("table_infos") or []
         for table_info in table_field:
             try:
-                df = pd.read_csv(table_info["path"])
-                if not df.empty and df.shape[1] > 1:
-                    df = df.fillna("")
+                columns = table_info.get("columns") or []
+                rows = list(zip(*columns))
+                if rows and len(columns) > 1:
                     table_blocks.append(
-                        f"Page {page_num} Table ({len(df)}×{len(df.columns)}):\n"
-                        f"{df.to_markdown(index=False)}"
+                        f"Page {page_num} Table ({len(rows)}×{len(columns)}):\n"
+                        f"{markdown_table(table_info.get('headers', []), rows)}"
                     )
             except Exception as e:
                 print(f"Table parse error on page {page_num}: {e}")
@@ -47,9 +58,13 @@ def build_context(parsed_data: List[Dict[str, Any]]) -> str:
                 chart_summary = f"Page {page_num} Chart ({chart_type}): {title}\n"
 
                 if entities and isinstance(entities, list):
-                    df = pd.DataFrame(entities)
-                    if not df.empty:
-                        chart_summary += df.to_markdown(index=False)
+                    rows = [e for e in entities if isinstance(e, dict)]
+                    headers = list(dict.fromkeys(k for e in rows for k in e))
+                    if headers:
+                        chart_summary += markdown_table(
+                            headers,
+                            [[e.get(h, "") for h in headers] for e in rows],
+                        )
                 elif metrics:
                     chart_summary += json.dumps(metrics, indent=2)
 
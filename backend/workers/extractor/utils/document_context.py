@@ -0,0 +1,144 @@
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+
+class DocumentContext:
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.fingerprint = _file_fingerprint(pdf_path)
+        self.fitz_doc = fitz.open(pdf_path)
+        self.plumber_pdf = pdfplumber.open(pdf_path)
+        self._page_dir = Path(tempfile.mkdtemp(prefix="aureus_pages_"))
+        self._page_pdfs: dict[int, str] = {}
+        self.page_images: dict[tuple[int, int], Any] = {}
+        self._drawings: dict[int, list[dict]] = {}
+        self._tables: dict[tuple[int, str], list[list[list]]] = {}
+
+    @property
+    def page_count(self) -> int:
+        return len(self.fitz_doc)
+
+    def fitz_page(self, page_num: int) -> fitz.Page:
+        return self.fitz_doc.load_page(page_num - 1)
+
+    def plumber_page(self, page_num: int):
+        total_pages = len(self.plumber_pdf.pages)
+        if page_num < 1 or page_num > total_pages:
+            raise IndexError(f"Page {page_num} out of range (1–{total_pages})")
+        return self.plumber_pdf.pages[page_num - 1]
+
+    def drawings(self, page_num: int) -> list[dict]:
+        # Read by both triage and table extraction
+        cached = self._drawings.get(page_num)
+        if cached is None:
+            cached = self.fitz_page(page_num).get_cdrawings()
+            self._drawings[page_num] = cached
+        return cached
+
+    def tables(self, page_num: int, strategy: str = "lines") -> list[list[list]]:
+        # find_tables is the costliest call triage makes; keep the cell text,
+        # not the Table objects, whose extract() reads module globals that
+        # the next find_tables call replaces.
+        key = (page_num, strategy)
+        cached = self._tables.get(key)
+        if cached is None:
+            found = self.fitz_page(page_num).find_tables(strategy=strategy)
+            cached = [table.extract() for table in found.tables]
+            self._tables[key] = cached
+        return cached
+
+    def single_page_pdf(self, page_num: int) -> str:
+        # camelot re-reads the whole document for every call; handing it a
+        # one-page copy keeps lattice + stream from reparsing the full file.
+        cached = self._page_pdfs.get(page_num)
+        if cached:
+            return cached
+
+        page_doc = fitz.open()
+        page_doc.insert_pdf(self.fitz_doc, from_page=page_num - 1, to_page=page_num - 1)
+        page_path = str(self._page_dir / f"page_{page_num}.pdf")
+        page_doc.save(page_path)
+        page_doc.close()
+
+        self._page_pdfs[page_num] = page_path
+        return page_path
+
+    def release_page(self, page_num: int):
+        for key in [k for k in self.page_images if k[0] == page_num]:
+            del self.page_images[key]
+        for key in [k for k in self._tables if k[0] == page_num]:
+            del self._tables[key]
+        self._drawings.pop(page_num, None)
+
+        try:
+            self.plumber_page(page_num).close()
+        except Exception:
+            pass
+
+        page_path = self._page_pdfs.pop(page_num, None)
+        if page_path:
+            try:
+                os.remove(page_path)
+            except OSError:
+                pass
+
+    def close(self):
+        for page_num in list(self._page_pdfs):
+            self.release_page(page_num)
+        try:
+            self.plumber_pdf.close()
+        except Exception:
+            pass
+        if not self.fitz_doc.is_closed:
+            self.fitz_doc.close()
+        try:
+            self._page_dir.rmdir()
+        except OSError:
+            pass
+
+
+# Concurrent jobs interleave chunks on the shared page pool, so each worker
+# keeps a few documents open instead of reopening on every switch.
+MAX_OPEN_DOCUMENTS = 2
+_document_cache: "OrderedDict[str, DocumentContext]" = OrderedDict()
+
+
+def _file_fingerprint(pdf_path: str) -> tuple[int, int]:
+    stat = os.stat(pdf_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _close(ctx: DocumentContext):
+    try:
+        ctx.close()
+    except Exception as e:
+        print(f"Failed to close document context: {e}")
+
+
+def get_document_context(pdf_path: str) -> DocumentContext:
+    ctx = _document_cache.get(pdf_path)
+    if ctx is not None and ctx.fingerprint == _file_fingerprint(pdf_path):
+        _document_cache.move_to_end(pdf_path)
+        return ctx
+
+    if ctx is not None:
+        _close(_document_cache.pop(pdf_path))
+    while len(_document_cache) >= MAX_OPEN_DOCUMENTS:
+        _, oldest = _document_cache.popitem(last=False)
+        _close(oldest)
+
+    ctx = DocumentContext(pdf_path)
+    _document_cache[pdf_path] = ctx
+    return ctx
+
+
+def close_document_context():
+    while _document_cache:
+        _, ctx = _document_cache.popitem(last=False)
+        _close(ctx)
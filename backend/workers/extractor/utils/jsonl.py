@@ -0,0 +1,20 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], path: str | Path) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def iter_jsonl(path: str | Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
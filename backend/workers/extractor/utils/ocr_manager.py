@@ -1,7 +1,26 @@
+from collections import OrderedDict
+from typing import TypedDict, cast
 import easyocr
+from backend.workers.extractor.utils.render_page import PageImage
 
 _easyocr_cache = None
 
+MAX_CACHED_OCR_RESULTS = 64
+
+
+class OCRBlock(TypedDict):
+    bbox: list[list[float]]
+    text: str
+    confidence: float
+
+
+class OCRResult(TypedDict):
+    blocks: list[OCRBlock]
+    text: str
+
+
+_ocr_results: "OrderedDict[str, OCRResult]" = OrderedDict()
+
 
 def load_easyocr(lang="en") -> easyocr.Reader:
     global _easyocr_cache
@@ -9,3 +28,78 @@ def load_easyocr(lang="en") -> easyocr.Reader:
         print(f"Initializing EasyOCR ({lang})...")
         _easyocr_cache = easyocr.Reader([lang])
     return _easyocr_cache
+
+
+RawOCRResult = list[tuple[list[list[float]], str, float]]
+
+
+def _to_ocr_result(raw: RawOCRResult) -> OCRResult:
+    blocks: list[OCRBlock] = [
+        {
+            "bbox": [[float(x), float(y)] for x, y in bbox],
+            "text": text,
+            "confidence": float(conf),
+        }
+        for bbox, text, conf in raw
+    ]
+    return {
+        "blocks": blocks,
+        "text": " ".join(b["text"] for b in blocks).strip(),
+    }
+
+
+def _store_ocr_result(key: str, result: OCRResult):
+    _ocr_results[key] = result
+    while len(_ocr_results) > MAX_CACHED_OCR_RESULTS:
+        _ocr_results.popitem(last=False)
+
+
+def run_ocr(image: PageImage) -> OCRResult:
+    key = image.content_key
+    cached = _ocr_results.get(key)
+    if cached is not None:
+        _ocr_results.move_to_end(key)
+        return cached
+
+    reader = load_easyocr()
+    raw = cast(RawOCRResult, reader.readtext(image.pixels, detail=1))
+    result = _to_ocr_result(raw)
+    _store_ocr_result(key, result)
+    return result
+
+
+def prefetch_ocr(images: list[PageImage], batch_size: int = 8):
+    pending = {
+        img.content_key: img for img in images if img.content_key not in _ocr_results
+    }
+    if not pending:
+        return
+
+    # readtext_batched stacks its inputs, so only same-sized pages can share
+    # a batch; decks are almost always a single page size.
+    by_shape: dict[tuple[int, ...], list[PageImage]] = {}
+    for img in pending.values():
+        by_shape.setdefault(img.pixels.shape, []).append(img)
+
+    reader = load_easyocr()
+    for group in by_shape.values():
+        for start in range(0, len(group), batch_size):
+            batch = group[start : start + batch_size]
+            if len(batch) == 1:
+                run_ocr(batch[0])
+                continue
+            try:
+                raw_batch = cast(
+                    list[RawOCRResult],
+                    reader.readtext_batched(
+                        [img.pixels for img in batch],
+                        batch_size=batch_size,
+                        detail=1,
+                    ),
+                )
+            except Exception as e:
+                print(f"Batched OCR failed ({e}); falling back to per-page OCR")
+                continue
+
+            for img, raw in zip(batch, raw_batch):
+                _store_ocr_result(img.content_key, _to_ocr_result(raw))
@@ -1,10 +1,20 @@
+import asyncio
 import base64
+import hashlib
 import json
-import time
-from rich import print
-from backend.workers.extractor.openai_client import openai_client
-import json, re
+import random
+import re
+from functools import lru_cache
 from typing import Any
+from openai import RateLimitError
+from rich import print
+from backend.workers.extractor.config.settings import get_settings
+from backend.workers.extractor.openai_client import async_openai_client
+from backend.workers.extractor.utils.rate_limiter import TokenBucket
+from backend.workers.extractor.utils.result_cache import DiskCache, cache_key
+
+# A ≤900px page at "auto" detail is billed as four 512px tiles plus the base.
+TOKENS_PER_IMAGE = 765
 
 
 BATCH_PROMPT = """
@@ -32,33 +42,94 @@ If you cannot detect structure in an image, include an entry:
 """
 
 
-def extract_charts_batch(
-    image_paths: list[str], model: str = "gpt-4o-mini", retries: int = 3
+VISION_PROMPT_VERSION = hashlib.sha256(BATCH_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache
+def get_vision_cache() -> DiskCache:
+    settings = get_settings()
+    return DiskCache(
+        settings.vision_cache_dir,
+        max_entries=settings.vision_cache_max_entries,
+        max_bytes=settings.vision_cache_max_mb * 1024 * 1024,
+    )
+
+
+NUMBER_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def vision_cache_key(phash: str, model: str) -> str:
+    return cache_key("vision", phash, VISION_PROMPT_VERSION, model)
+
+
+def vision_fingerprint(text: str) -> str:
+    # The pHash survives re-encoding, so the same slide from another deck
+    # hits; slides built from one template can share it while showing other
+    # figures, so a hit must also carry the same numbers in its text layer.
+    numbers = [n.replace(",", "") for n in NUMBER_PATTERN.findall(text or "")]
+    return hashlib.sha256(" ".join(numbers).encode("utf-8")).hexdigest()
+
+
+def estimate_batch_tokens(image_count: int, max_tokens: int = 2000) -> int:
+    return len(BATCH_PROMPT) // 4 + image_count * TOKENS_PER_IMAGE + max_tokens
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def backoff_seconds(attempt: int, base: float = 2.0, cap: float = 30.0) -> float:
+    return min(base * 2 ** (attempt - 1), cap) * random.uniform(0.5, 1.5)
+
+
+@lru_cache
+def get_vision_rate_limiter() -> TokenBucket:
+    settings = get_settings()
+    return TokenBucket(settings.vision_rpm, settings.vision_tpm)
+
+
+async def extract_charts_batch(
+    images: list[bytes],
+    model: str = "gpt-4o-mini",
+    retries: int = 3,
+    limiter: TokenBucket | None = None,
 ):
-    if not image_paths:
+    if not images:
         return []
 
+    limiter = limiter or get_vision_rate_limiter()
+
     try:
-        print(
-            f"[cyan]Analyzing {len(image_paths)} pages with OpenAI Vision batch...[/cyan]"
-        )
+        print(f"[cyan]Analyzing {len(images)} pages with OpenAI Vision batch...[/cyan]")
 
         image_inputs = []
-        for idx, path in enumerate(image_paths, 1):
-            with open(path, "rb") as f:
-                img_b64 = base64.b64encode(f.read()).decode("utf-8")
+        for jpeg in images:
+            img_b64 = base64.b64encode(jpeg).decode("utf-8")
             image_inputs.append(
                 {
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{img_b64}"},
+                    "image_url": {"url": f"data:image/jpeg;base64,{img_b64}"},
                 }
             )
 
         raw_output = None
+        estimated_tokens = estimate_batch_tokens(len(images))
 
         for attempt in range(1, retries + 1):
             try:
-                response = openai_client.chat.completions.create(
+                await limiter.acquire(estimated_tokens)
+                response = await async_openai_client.chat.completions.create(
                     model=model,
                     messages=[
                         {"role": "system", "content": BATCH_PROMPT},
@@ -67,7 +138,7 @@ def extract_charts_batch(
                             "content": [
                                 {
                                     "type": "text",
-                                    "text": f"Analyze these {len(image_paths)} pages.",
+                                    "text": f"Analyze these {len(images)} pages.",
                                 },
                                 *image_inputs,
                             ],
@@ -92,24 +163,21 @@ def extract_charts_batch(
 
             except json.JSONDecodeError as e:
                 print(f"Non-JSON response: {str(e)}")
-                snippet = (
-                    raw_output[:300]
-                    if "content" in locals() and raw_output is not None
-                    else ""
-                )
+                snippet = raw_output[:300] if raw_output is not None else ""
                 print(f"Partial output: {snippet!r}")
                 return []
 
+            except RateLimitError as e:
+                wait = retry_after_seconds(e) or backoff_seconds(attempt, base=5.0)
+                limiter.pause(wait)
+                print(f"[yellow]Rate limited — retrying in {wait:.1f}s...[/yellow]")
+
             except Exception as e:
-                if "rate_limit" in str(e).lower() or "429" in str(e):
-                    wait = 5 * attempt
-                    print(f"[yellow]Rate limited — retrying in {wait}s...[/yellow]")
-                    time.sleep(wait)
-                    continue
                 print(
                     f"[red]Vision batch error (attempt {attempt}/{retries}): {e}[/red]"
                 )
-                time.sleep(2)
+                wait = retry_after_seconds(e) or backoff_seconds(attempt)
+                await asyncio.sleep(wait)
 
         print("[red]Batch Vision failed after retries.[/red]")
         return [{"page_type": "unknown", "error": "Failed batch parsing"}]
@@ -119,6 +187,86 @@ def extract_charts_batch(
         return []
 
 
+class VisionBatcher:
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_images: int = 5,
+        max_bytes: int = 900_000,
+        model: str = "gpt-4o-mini",
+        cache: DiskCache | None = None,
+    ):
+        self.max_images = max_images
+        self.max_bytes = max_bytes
+        self.model = model
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._batch: list[dict] = []
+        self._batch_bytes = 0
+        self._tasks: list[asyncio.Task] = []
+
+    def add(self, page: dict):
+        image = page.get("vision_image")
+        if not image:
+            return
+
+        phash = page.get("vision_phash")
+        if self.cache is not None and phash:
+            fingerprint = vision_fingerprint(page.get("text", ""))
+            cached = self.cache.get(
+                vision_cache_key(phash, self.model),
+                accept=lambda entry: isinstance(entry, dict)
+                and entry.get("fingerprint") == fingerprint,
+            )
+            if cached is not None:
+                page["chart_json"] = cached["result"]
+                page["vision_cache_hit"] = True
+                return
+
+        if self._batch and self._batch_bytes + len(image) > self.max_bytes:
+            self.flush()
+        self._batch.append(page)
+        self._batch_bytes += len(image)
+        if len(self._batch) >= self.max_images:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        idx = len(self._tasks) + 1
+        self._tasks.append(asyncio.create_task(self._analyze(idx, batch)))
+
+    async def _analyze(self, idx: int, batch: list[dict]):
+        async with self._semaphore:
+            print(f"Analyzing vision batch {idx} ({len(batch)} pages)...")
+            res = await extract_charts_batch(
+                [p["vision_image"] for p in batch], model=self.model
+            )
+        if not res:
+            print(f"Vision batch {idx} returned no results")
+        for p, r in zip(batch, res):
+            p["chart_json"] = r
+            if (
+                self.cache is not None
+                and p.get("vision_phash")
+                and isinstance(r, dict)
+                and "error" not in r
+            ):
+                key = vision_cache_key(p["vision_phash"], self.model)
+                fingerprint = vision_fingerprint(p.get("text", ""))
+                self.cache.set(key, {"fingerprint": fingerprint, "result": r})
+
+    async def drain(self) -> int:
+        self.flush()
+        await asyncio.gather(*self._tasks)
+        return len(self._tasks)
+
+    def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+
+
 def extract_json_safely(raw: str) -> Any:
     if not raw:
         raise ValueError("Empty model response")
@@ -0,0 +1,100 @@
+import math
+import multiprocessing as mp
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from rich import print
+
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_workers = 0
+_page_pool_ocr_threads = 0
+_page_pool_lock = threading.RLock()
+
+
+def _warm_worker(ocr_threads: int = 0):
+    import torch
+    import cv2  # noqa: F401
+    import fitz  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import camelot.io  # noqa: F401
+    from backend.workers.extractor.utils import process_page  # noqa: F401
+    from backend.workers.extractor.utils.ocr_manager import load_easyocr
+
+    if ocr_threads > 0:
+        torch.set_num_threads(ocr_threads)
+    load_easyocr()
+
+
+def start_page_pool(max_workers: int, ocr_threads: int = 0) -> ProcessPoolExecutor:
+    with _page_pool_lock:
+        return _start_page_pool(max_workers, ocr_threads)
+
+
+def _start_page_pool(max_workers: int, ocr_threads: int) -> ProcessPoolExecutor:
+    global _page_pool, _page_pool_workers, _page_pool_ocr_threads
+    if _page_pool is not None and _page_pool_workers == max_workers:
+        return _page_pool
+
+    shutdown_page_pool()
+    print(f"[yellow]Starting page pool with {max_workers} warm workers...[/yellow]")
+    _page_pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_warm_worker,
+        initargs=(ocr_threads,),
+    )
+    _page_pool_workers = max_workers
+    _page_pool_ocr_threads = ocr_threads
+
+    # Submitting no-ops forces every worker to spawn (and warm up) now rather
+    # than lazily on the first job.
+    for fut in [_page_pool.submit(int) for _ in range(max_workers)]:
+        fut.result()
+    print("[green]Page pool ready.[/green]")
+    return _page_pool
+
+
+def get_page_pool(max_workers: int) -> ProcessPoolExecutor:
+    with _page_pool_lock:
+        if _page_pool is None:
+            return _start_page_pool(max_workers, 0)
+        return _page_pool
+
+
+def reset_page_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor | None:
+    # Every job that saw the crash asks for a reset; only the first one for
+    # this pool generation restarts it, the rest get the replacement.
+    with _page_pool_lock:
+        if _page_pool is not broken:
+            return _page_pool
+        workers, ocr_threads = _page_pool_workers, _page_pool_ocr_threads
+        shutdown_page_pool()
+        if workers:
+            return start_page_pool(workers, ocr_threads)
+        return None
+
+
+def shutdown_page_pool():
+    global _page_pool, _page_pool_workers
+    with _page_pool_lock:
+        if _page_pool is not None:
+            try:
+                _page_pool.shutdown(wait=False, cancel_futures=True)
+            except Exception as e:
+                print(f"[red]Page pool shutdown failed: {e}[/red]")
+        _page_pool = None
+        _page_pool_workers = 0
+
+
+def page_chunks(
+    total_pages: int, workers: int, max_chunk_size: int = 8
+) -> list[tuple[int, int]]:
+    # Aim for ~4 chunks per worker so a slow page range doesn't leave the
+    # rest of the pool idle, while still amortising IPC over several pages.
+    chunk_size = math.ceil(total_pages / max(workers * 4, 1))
+    chunk_size = max(1, min(max_chunk_size, chunk_size))
+    return [
+        (start, min(start + chunk_size - 1, total_pages))
+        for start in range(1, total_pages + 1, chunk_size)
+    ]
@@ -0,0 +1,199 @@
+from typing import Iterable, TypedDict
+import fitz  # PyMuPDF
+from rich import print
+from backend.workers.extractor.utils.document_context import (
+    DocumentContext,
+    get_document_context,
+)
+
+
+TEXT_ONLY = "text_only"
+TABLE_LIKELY = "table_likely"
+CHART_LIKELY = "chart_likely"
+SCANNED = "scanned"
+
+# Stages each profile runs; anything not listed is skipped for that page.
+PROFILE_STAGES = {
+    TEXT_ONLY: {"text"},
+    TABLE_LIKELY: {"text", "tables"},
+    CHART_LIKELY: {"text", "tables", "render"},
+    SCANNED: {"text", "render"},
+}
+
+
+class PageStats(TypedDict):
+    text_blocks: int
+    image_count: int
+    drawing_count: int
+    char_count: int
+    digit_ratio: float
+    text_coverage: float
+    image_coverage: float
+    ruling_grid: bool
+    table_count: int
+
+
+Segment = tuple[float, float, float]  # position, start, end
+
+RULE_TOLERANCE = 2.0
+
+
+def _merge_segments(segments: list[Segment]) -> list[Segment]:
+    # Joins collinear pieces, e.g. the edges of neighbouring cell rectangles
+    merged: list[Segment] = []
+    for pos, start, end in sorted(segments, key=lambda s: (round(s[0]), s[1])):
+        if (
+            merged
+            and abs(merged[-1][0] - pos) <= RULE_TOLERANCE
+            and start <= merged[-1][2] + RULE_TOLERANCE
+        ):
+            last = merged[-1]
+            merged[-1] = (last[0], last[1], max(last[2], end))
+        else:
+            merged.append((pos, start, end))
+    return merged
+
+
+def ruling_segments(drawings: Iterable[dict]) -> tuple[list[Segment], list[Segment]]:
+    horizontal: list[Segment] = []
+    vertical: list[Segment] = []
+    for path in drawings:
+        # Outlines of unfilled rectangles are cell borders; filled shapes such
+        # as chart bars are not rulings.
+        outlined = "s" in (path.get("type") or "") and path.get("fill") is None
+        for item in path["items"]:
+            if item[0] == "l":
+                (x0, y0), (x1, y1) = item[1], item[2]
+                if abs(y0 - y1) < 1 and abs(x0 - x1) > 10:
+                    horizontal.append((y0, min(x0, x1), max(x0, x1)))
+                elif abs(x0 - x1) < 1 and abs(y0 - y1) > 5:
+                    vertical.append((x0, min(y0, y1), max(y0, y1)))
+            elif item[0] == "re":
+                x0, y0, x1, y1 = fitz.Rect(item[1])
+                if y1 - y0 < 2 and x1 - x0 > 10:
+                    horizontal.append(((y0 + y1) / 2, x0, x1))
+                elif x1 - x0 < 2 and y1 - y0 > 5:
+                    vertical.append(((x0 + x1) / 2, y0, y1))
+                elif outlined:
+                    horizontal += [(y0, x0, x1), (y1, x0, x1)]
+                    vertical += [(x0, y0, y1), (x1, y0, y1)]
+    return _merge_segments(horizontal), _merge_segments(vertical)
+
+
+def has_ruling_grid(
+    drawings: Iterable[dict], min_rows: int = 3, min_cols: int = 3
+) -> bool:
+    horizontal, vertical = ruling_segments(drawings)
+    if len(horizontal) < min_rows or len(vertical) < min_cols:
+        return False
+
+    tol = RULE_TOLERANCE
+    crossings = [
+        {
+            round(y)
+            for y, hx0, hx1 in horizontal
+            if hx0 - tol <= x <= hx1 + tol and y0 - tol <= y <= y1 + tol
+        }
+        for x, y0, y1 in vertical
+    ]
+    # A grid needs several rows each crossed by several column rules; a
+    # chart's gridlines meet one axis (or a frame) and stop there.
+    row_hits: dict[int, int] = {}
+    for rows in crossings:
+        for y in rows:
+            row_hits[y] = row_hits.get(y, 0) + 1
+    rows = {y for y, hits in row_hits.items() if hits >= min_cols}
+    columns = sum(1 for crossed in crossings if len(crossed & rows) >= min_rows)
+    return len(rows) >= min_rows and columns >= min_cols
+
+
+def is_plausible_table(rows: list[list]) -> bool:
+    # "lines" tables are also found in charts, whose bars and gridlines form
+    # mostly empty cells; real tables fill at least half of theirs.
+    cells = [cell for row in rows for cell in row]
+    filled = sum(1 for cell in cells if cell is not None and str(cell).strip())
+    cols = max((len(row) for row in rows), default=0)
+    return len(rows) >= 3 and cols >= 2 and filled * 2 >= len(cells)
+
+
+def detected_tables(ctx: DocumentContext, page_num: int) -> int:
+    return sum(1 for rows in ctx.tables(page_num, "lines") if is_plausible_table(rows))
+
+
+def is_table_candidate(digit_ratio: float, drawing_count: int) -> bool:
+    return digit_ratio > 0.15 or drawing_count >= 6
+
+
+def page_stats(ctx: DocumentContext, page_num: int) -> PageStats:
+    page = ctx.fitz_page(page_num)
+    page_area = max(abs(page.rect), 1.0)
+
+    text_blocks = 0
+    text_area = 0.0
+    chars = digits = 0
+    for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks"):
+        if block_type != 0 or not text.strip():
+            continue
+        text_blocks += 1
+        text_area += abs(fitz.Rect(x0, y0, x1, y1))
+        stripped = "".join(text.split())
+        chars += len(stripped)
+        digits += sum(c.isdigit() for c in stripped)
+
+    images = page.get_image_info()
+    image_area = sum(abs(fitz.Rect(img["bbox"]) & page.rect) for img in images)
+
+    drawings = ctx.drawings(page_num)
+    digit_ratio = digits / max(chars, 1)
+
+    # Table evidence is only gathered for pages that could be routed to the
+    # table profile; find_tables is the costly part, so it runs last. Both
+    # are cached on the context for the table stage to reuse.
+    ruling_grid = False
+    table_count = 0
+    if is_table_candidate(digit_ratio, len(drawings)):
+        ruling_grid = has_ruling_grid(drawings)
+        if not ruling_grid:
+            table_count = detected_tables(ctx, page_num)
+
+    return {
+        "text_blocks": text_blocks,
+        "image_count": len(images),
+        "drawing_count": len(drawings),
+        "char_count": chars,
+        "digit_ratio": digit_ratio,
+        "text_coverage": min(text_area / page_area, 1.0),
+        "image_coverage": min(image_area / page_area, 1.0),
+        "ruling_grid": ruling_grid,
+        "table_count": table_count,
+    }
+
+
+def classify_page(stats: PageStats) -> str:
+    if stats["char_count"] < 50:
+        return SCANNED
+    if stats["image_coverage"] > 0.25 or stats["drawing_count"] > 150:
+        return CHART_LIKELY
+    if is_table_candidate(stats["digit_ratio"], stats["drawing_count"]):
+        # Numbers and vector shapes are just as typical of charts; without a
+        # ruled grid or a detected table the page gets the full treatment.
+        if stats["ruling_grid"] or stats["table_count"]:
+            return TABLE_LIKELY
+        return CHART_LIKELY
+    if stats["image_count"] and stats["text_coverage"] < 0.2:
+        return CHART_LIKELY
+    return TEXT_ONLY
+
+
+def triage_page(pdf_path: str, page_num: int) -> str:
+    stats = page_stats(get_document_context(pdf_path), page_num)
+    profile = classify_page(stats)
+    # Per-page inputs, so the thresholds can be calibrated from worker logs
+    print(
+        f"[dim]Page {page_num} triage: {profile} "
+        f"(chars={stats['char_count']}, digits={stats['digit_ratio']:.2f}, "
+        f"drawings={stats['drawing_count']}, images={stats['image_count']}, "
+        f"image_cov={stats['image_coverage']:.2f}, "
+        f"grid={stats['ruling_grid']}, tables={stats['table_count']})[/dim]"
+    )
+    return profile
@@ -1,3 +1,4 @@
+from typing import Optional
 from rich import print
 
 
@@ -13,63 +14,93 @@ def should_use_vision(analysis: dict, text: str) -> bool:
     return True
 
 
-def process_page(pdf_path: str, page_num: int, openai_enabled: bool = True):
+def process_page(
+    pdf_path: str,
+    page_num: int,
+    openai_enabled: bool = True,
+    table_engine: str = "pymupdf",
+    profile: Optional[str] = None,
+):
     from .table_extractor import extract_tables_from_page
     from .text_extractor import extract_text_from_pdf
-    from .render_page import render_page_to_image
+    from .render_page import render_page_to_image, preprocess_for_vision
     from .chart_detector import analyze_page
     from .easyocr_fallback import extract_easyocr_text
+    from .document_context import get_document_context
+    from .page_triage import PROFILE_STAGES, triage_page
 
     try:
-        table_infos = extract_tables_from_page(pdf_path, page_num)
+        profile = profile or triage_page(pdf_path, page_num)
+        stages = PROFILE_STAGES[profile]
+
+        table_infos = []
+        if "tables" in stages:
+            table_infos = extract_tables_from_page(
+                pdf_path, page_num, engine=table_engine
+            )
 
         text_info = extract_text_from_pdf(pdf_path, page_num) or {}
         text = str(text_info.get("text", "")).strip()
         text_length = len(text)
         print(f"[debug] Page {page_num} text len={len(text)}, preview={text[:100]!r}")
 
-        img_path = render_page_to_image(pdf_path, page_num)
-        analysis = analyze_page(img_path)
-        visual_score = analysis.get("visual_score", 0.0)
-        has_chart_like_elements = visual_score > 0.45
-
         ocr_engine = "embedded"
         ocr_text = text
         chart_json = None
         needs_vision = False
+        vision_image = None
+        vision_phash = None
 
-        if has_chart_like_elements:
-            print(
-                f"[blue]Page {page_num}: Chart/visual detected (score={visual_score:.2f})[/blue]"
-            )
-            if openai_enabled and should_use_vision(analysis, text):
-                needs_vision = True
-                print(f"Marked {img_path} for Vision batch")
-                ocr_engine = "openai-vision+embedded"
-            else:
+        analysis = {"type": "text_only", "visual_score": 0.0}
+        visual_score = 0.0
+
+        # Only chart-likely and scanned pages are rendered; everything else
+        # exits here with its embedded text (and tables, if table-likely).
+        if "render" not in stages:
+            print(f"[green]Page {page_num}: {profile} ({text_length} chars)[/green]")
+        else:
+            image = render_page_to_image(pdf_path, page_num)
+            analysis = analyze_page(image)
+            visual_score = analysis.get("visual_score", 0.0)
+            has_chart_like_elements = visual_score > 0.45
+
+            if has_chart_like_elements:
                 print(
-                    "[dim cyan]Vision skipped due to low visual signal or redundant content[/dim cyan]"
+                    f"[blue]Page {page_num}: Chart/visual detected (score={visual_score:.2f})[/blue]"
                 )
-                ocr_text = extract_easyocr_text(img_path, visualize=False)["text"]
-                ocr_engine = "easyocr+embedded"
+                if openai_enabled and should_use_vision(analysis, text):
+                    needs_vision = True
+                    vision_page = preprocess_for_vision(image)
+                    vision_image = vision_page.encode_jpeg(quality=50)
+                    vision_phash = vision_page.perceptual_hash()
+                    print(f"Marked page {page_num} for Vision batch")
+                    ocr_engine = "openai-vision+embedded"
+                else:
+                    print(
+                        "[dim cyan]Vision skipped due to low visual signal or redundant content[/dim cyan]"
+                    )
+                    ocr_text = extract_easyocr_text(image, visualize=False)["text"]
+                    ocr_engine = "easyocr+embedded"
 
-        elif text_length > 50:
-            print(f"[green]Page {page_num}: Text-only ({text_length} chars)[/green]")
+            elif text_length > 50:
+                print(
+                    f"[green]Page {page_num}: Text-only ({text_length} chars)[/green]"
+                )
 
-        else:
-            print(
-                f"[yellow]Page {page_num}: Low text ({text_length} chars) — trying OCR[/yellow]"
-            )
-            try:
-                easy = extract_easyocr_text(img_path, visualize=False)
+            else:
+                print(
+                    f"[yellow]Page {page_num}: Low text ({text_length} chars) — trying OCR[/yellow]"
+                )
+                try:
+                    easy = extract_easyocr_text(image, visualize=False)
 
-                ocr_text = easy["text"]
-                ocr_engine = "easyocr"
+                    ocr_text = easy["text"]
+                    ocr_engine = "easyocr"
 
-            except Exception as e:
-                print(f"[red]All OCR failed for page {page_num}: {e}[/red]")
-                ocr_text = ""
-                ocr_engine = "none"
+                except Exception as e:
+                    print(f"[red]All OCR failed for page {page_num}: {e}[/red]")
+                    ocr_text = ""
+                    ocr_engine = "none"
 
         return {
             "page": page_num,
@@ -81,7 +112,9 @@ def process_page(pdf_path: str, page_num: int, openai_enabled: bool = True):
             "chars": len(ocr_text),
             "visual_score": visual_score,
             "needs_vision": needs_vision,
-            "img_path": img_path,
+            "vision_image": vision_image,
+            "vision_phash": vision_phash,
+            "profile": profile,
         }
 
     except Exception as e:
@@ -94,3 +127,53 @@ def process_page(pdf_path: str, page_num: int, openai_enabled: bool = True):
             "analysis": {},
             "chars": 0,
         }
+
+    finally:
+        try:
+            get_document_context(pdf_path).release_page(page_num)
+        except Exception:
+            pass
+
+
+def process_page_range(
+    pdf_path: str,
+    start_page: int,
+    end_page: int,
+    openai_enabled: bool = True,
+    ocr_batch_size: int = 8,
+    table_engine: str = "pymupdf",
+    triage: bool = True,
+) -> list[dict]:
+    from .render_page import render_page_to_image
+    from .ocr_manager import prefetch_ocr
+    from .page_triage import CHART_LIKELY, PROFILE_STAGES, triage_page
+
+    page_nums = list(range(start_page, end_page + 1))
+
+    profiles = {}
+    for n in page_nums:
+        try:
+            profiles[n] = triage_page(pdf_path, n) if triage else CHART_LIKELY
+        except Exception as e:
+            print(f"[yellow]Triage failed for page {n}: {e}[/yellow]")
+            profiles[n] = CHART_LIKELY
+
+    # Rendered pages are OCR'd during analysis, so run them through EasyOCR
+    # in batches up front; process_page then reads from the cache.
+    try:
+        images = [
+            render_page_to_image(pdf_path, n)
+            for n in page_nums
+            if "render" in PROFILE_STAGES[profiles[n]]
+        ]
+        prefetch_ocr(images, batch_size=ocr_batch_size)
+    except Exception as e:
+        print(
+            f"[yellow]Batched OCR prefetch failed for pages "
+            f"{start_page}-{end_page}: {e}[/yellow]"
+        )
+
+    return [
+        process_page(pdf_path, n, openai_enabled, table_engine, profiles[n])
+        for n in page_nums
+    ]
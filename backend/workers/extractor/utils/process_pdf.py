@@ -1,52 +1,118 @@
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import asyncio
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator
 from rich.progress import Progress
 from rich import print
-from backend.workers.extractor.utils.process_page import process_page
+from backend.workers.extractor.utils.page_pool import (
+    get_page_pool,
+    page_chunks,
+    reset_page_pool,
+)
+from backend.workers.extractor.utils.process_page import process_page_range
 
 
-def process_pdf(pdf_path: str, max_workers: int = 2):
+def count_pdf_pages(pdf_path: str) -> int:
     import fitz
 
-    doc = fitz.open(pdf_path)
-    total_pages = len(doc)
-    if not doc.is_closed:
-        try:
-            doc.close()
-        except Exception:
-            pass
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
+
+
+async def stream_pdf(
+    pdf_path: str,
+    max_workers: int = 2,
+    max_chunk_size: int = 8,
+    ocr_batch_size: int = 8,
+    table_engine: str = "pymupdf",
+    triage: bool = True,
+) -> AsyncIterator[dict]:
+    total_pages = await asyncio.to_thread(count_pdf_pages, pdf_path)
 
     print(f"[yellow]Starting extraction for:[/yellow] {pdf_path}")
     print(f"[cyan]Total pages:[/cyan] {total_pages}")
 
-    results = []
+    chunks = page_chunks(total_pages, max_workers, max_chunk_size)
+    print(f"[cyan]Page chunks:[/cyan] {len(chunks)}")
+
+    executor = await asyncio.to_thread(get_page_pool, max_workers)
+    futures: dict[asyncio.Future, tuple[int, int, ProcessPoolExecutor]] = {}
+    retried: set[tuple[int, int]] = set()
+
+    def submit(pool: ProcessPoolExecutor, start: int, end: int) -> asyncio.Future:
+        fut = asyncio.wrap_future(
+            pool.submit(
+                process_page_range,
+                pdf_path,
+                start,
+                end,
+                True,
+                ocr_batch_size,
+                table_engine,
+                triage,
+            )
+        )
+        futures[fut] = (start, end, pool)
+        return fut
+
+    pending = {submit(executor, start, end) for start, end in chunks}
+    extracted = 0
+    profiles: Counter[str] = Counter()
 
     with Progress() as progress:
         task = progress.add_task("[cyan]Extracting pages...", total=total_pages)
 
-        with ProcessPoolExecutor(
-            max_workers=max_workers,
-        ) as executor:
-            futures = {
-                executor.submit(
-                    process_page,
-                    pdf_path,
-                    i,
-                    True,
-                ): i
-                for i in range(1, total_pages + 1)
-            }
-
-            for fut in as_completed(futures):
-                page_num = futures[fut]
-                try:
-                    result = fut.result()
-                except Exception as e:
-                    result = {"page": page_num, "error": str(e)}
-
-                results.append(result)
-                progress.advance(task)
-
-    results.sort(key=lambda x: x["page"])
-
-    print(f"[green]Parallel extraction complete for {len(results)} pages.[/green]")
-    return results
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in done:
+                    start, end, pool = futures[fut]
+                    try:
+                        chunk_results = fut.result()
+                    except (BrokenProcessPool, asyncio.CancelledError) as e:
+                        # A worker died, or another job restarted the shared
+                        # pool and cancelled this chunk with it: retry the
+                        # chunk once on the current pool.
+                        if (start, end) not in retried:
+                            retried.add((start, end))
+                            if isinstance(e, BrokenProcessPool):
+                                print(
+                                    "[red]Page pool worker died; restarting pool.[/red]"
+                                )
+                            replacement = await asyncio.to_thread(reset_page_pool, pool)
+                            if replacement is not None:
+                                pending.add(submit(replacement, start, end))
+                                continue
+                        chunk_results = [
+                            {
+                                "page": page_num,
+                                "error": f"Page pool failed: {e!r}",
+                            }
+                            for page_num in range(start, end + 1)
+                        ]
+                    except Exception as e:
+                        chunk_results = [
+                            {"page": page_num, "error": str(e)}
+                            for page_num in range(start, end + 1)
+                        ]
+
+                    progress.advance(task, len(chunk_results))
+                    extracted += len(chunk_results)
+                    for result in chunk_results:
+                        profiles[result.get("profile", "failed")] += 1
+                        yield result
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    print(f"[green]Parallel extraction complete for {extracted} pages.[/green]")
+    if extracted:
+        not_rendered = profiles["text_only"] + profiles["table_likely"]
+        print(
+            f"[cyan]Page triage:[/cyan] "
+            + ", ".join(f"{name}={count}" for name, count in sorted(profiles.items()))
+            + f" — {not_rendered}/{extracted} pages skipped rendering and OCR"
+        )
@@ -1,5 +1,8 @@
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import locale
+from typing import Dict, List
 
 
 try:
@@ -198,14 +201,170 @@ Generate only the final JSON.
 """
 
 
+def report_date() -> str:
+    return datetime.now().strftime("%d %B, %Y")
+
+
 def build_financial_prompt(
     context: str,
     company_name: str,
 ) -> str:
-    today = datetime.now().strftime("%d %B, %Y")
-
     return (
         PROMPT_TEMPLATE.replace("{company_name}", company_name)
-        .replace("{report_date}", today)
+        .replace("{report_date}", report_date())
+        .replace("{context}", context)
+    )
+
+
+REPAIR_PROMPT_TEMPLATE = """
+Respond only with raw JSON text.
+
+You are an expert equity research analyst. A structured report for {company_name} was generated from the data below, but these sections failed validation:
+
+{errors}
+
+Regenerate ONLY these sections from the data input. Return a single JSON object whose keys are exactly: {sections}.
+Each section must follow this schema:
+
+{schemas}
+
+Follow the same rules as the full report: numbers must be number types, use null for missing data, never infer or recalculate figures, keep period labels in chronological order, and each "rows" entry must have as many values as there are "columns".
+
+---
+
+DATA INPUT
+{context}
+
+---
+
+Generate only the JSON object with the requested sections.
+"""
+
+
+@lru_cache(maxsize=None)
+def section_schema(section: str) -> str:
+    # Brace-match the section's snippet out of the OUTPUT FORMAT example so
+    # repair prompts can never drift from the full prompt.
+    schema = PROMPT_TEMPLATE[PROMPT_TEMPLATE.index("OUTPUT FORMAT") :]
+    start = schema.find(f'\n  "{section}":')
+    if start == -1:
+        raise KeyError(f"No schema snippet for section '{section}'")
+
+    start = schema.index(":", start) + 1
+    while schema[start] not in "{[":
+        start += 1
+
+    depth, in_string = 0, False
+    for end in range(start, len(schema)):
+        char = schema[end]
+        if char == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return schema[start : end + 1]
+    raise ValueError(f"Unbalanced schema snippet for section '{section}'")
+
+
+def build_repair_prompt(
+    context: str,
+    company_name: str,
+    errors: Dict[str, List[str]],
+) -> str:
+    sections = sorted(errors)
+    schemas = "\n\n".join(
+        f'"{section}": {section_schema(section)}' for section in sections
+    )
+    error_lines = "\n".join(
+        f"- {section}: {'; '.join(messages[:3])}"
+        for section, messages in sorted(errors.items())
+    )
+
+    return (
+        REPAIR_PROMPT_TEMPLATE.replace("{schemas}", schemas)
+        .replace("{errors}", error_lines)
+        .replace("{sections}", ", ".join(f'"{s}"' for s in sections))
+        .replace("{company_name}", company_name)
+        .replace("{report_date}", report_date())
         .replace("{context}", context)
     )
+
+
+SECTION_QUERIES: Dict[str, str] = {
+    "report_meta": "rating target price cmp market price sector industry",
+    "summary": "highlights revenue ebitda pat profit growth quarter yoy performance",
+    "company_snapshot": (
+        "market cap capitalisation enterprise value shares outstanding free float "
+        "dividend yield beta face value volume 52 week high low"
+    ),
+    "shareholding_pattern": (
+        "shareholding pattern promoter promoters fii fiis fpi mutual funds dii "
+        "public holding"
+    ),
+    "price_performance": "share price stock performance return sensex nifty 3m 6m 1y",
+    "financial_highlights": (
+        "revenue sales total income ebitda pat profit after tax eps margin quarter "
+        "yoy qoq fy"
+    ),
+    "outlook_and_valuation": (
+        "outlook guidance valuation pe pb ev ebitda roe roce risk capex target"
+    ),
+    "key_highlights": (
+        "capacity expansion order book launch acquisition partnership digital cost "
+        "plant strategy regulatory"
+    ),
+}
+
+
+STRICT_RULES = PROMPT_TEMPLATE[
+    PROMPT_TEMPLATE.index("STRICT RULES") : PROMPT_TEMPLATE.index("DATA INPUT")
+]
+
+SECTION_PROMPT_TEMPLATE = (
+    PROMPT_TEMPLATE[: PROMPT_TEMPLATE.index("OUTPUT FORMAT")]
+    + """OUTPUT FORMAT
+Return a JSON object with the single key "{section}" following exactly this schema:
+
+{
+  "{section}": {schema}
+}
+
+"""
+    + STRICT_RULES
+    + """DATA INPUT
+Below content contains the pages most relevant to this section, extracted from PDFs or OCR with tables flattened.
+{context}
+
+---
+
+Generate only the final JSON.
+"""
+)
+
+
+def build_section_prompt(section: str, context: str, company_name: str) -> str:
+    return (
+        SECTION_PROMPT_TEMPLATE.replace("{schema}", section_schema(section))
+        .replace("{section}", section)
+        .replace("{company_name}", company_name)
+        .replace("{report_date}", report_date())
+        .replace("{context}", context)
+    )
+
+
+# Covers every template and retrieval query that shapes a generated report,
+# so editing any of them invalidates cached reports
+PROMPT_VERSION = hashlib.sha256(
+    "\x00".join(
+        [
+            PROMPT_TEMPLATE,
+            REPAIR_PROMPT_TEMPLATE,
+            SECTION_PROMPT_TEMPLATE,
+            *(f"{k}={v}" for k, v in sorted(SECTION_QUERIES.items())),
+        ]
+    ).encode("utf-8")
+).hexdigest()[:12]
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_capacity = float(max(requests_per_minute, 1))
+        self.token_capacity = float(max(tokens_per_minute, 1))
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self.request_capacity,
+            self._requests + elapsed * self.request_capacity / 60.0,
+        )
+        self._tokens = min(
+            self.token_capacity,
+            self._tokens + elapsed * self.token_capacity / 60.0,
+        )
+
+    async def acquire(self, tokens: int):
+        tokens = min(float(tokens), self.token_capacity)
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+
+                wait_requests = (1 - self._requests) * 60.0 / self.request_capacity
+                wait_tokens = (tokens - self._tokens) * 60.0 / self.token_capacity
+                await asyncio.sleep(max(wait_requests, wait_tokens, 0.05))
+
+    def pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
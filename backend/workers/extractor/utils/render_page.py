@@ -1,51 +1,81 @@
-import os
+import hashlib
 from pathlib import Path
+from typing import Optional
 import fitz  # PyMuPDF
 import cv2
 import numpy as np
+from backend.workers.extractor.utils.document_context import get_document_context
 
 
-def render_page_to_image(pdf_path: str, page_num: int, dpi: int = 96) -> str:
-    doc = fitz.open(pdf_path)
-    page = doc.load_page(page_num - 1)
+class PageImage:
+    __slots__ = ("pixels", "name", "_content_key")
 
-    zoom = dpi / 72.0
-    mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat, alpha=False)
+    def __init__(self, pixels: np.ndarray, name: str):
+        self.pixels = pixels  # single-channel uint8, H x W
+        self.name = name
+        self._content_key: Optional[str] = None
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
 
-    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
-    img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
 
-    h, w = img.shape[:2]
-    scale = 1024 / max(w, h)
-    if scale < 1.0:
-        img = cv2.resize(
-            img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA
+    @property
+    def content_key(self) -> str:
+        if self._content_key is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(str(self.pixels.shape).encode())
+            digest.update(np.ascontiguousarray(self.pixels).data)
+            self._content_key = digest.hexdigest()
+        return self._content_key
+
+    def perceptual_hash(self) -> str:
+        # 64-bit DCT pHash: robust to re-encoding and small rendering noise,
+        # so the same slide from another deck maps to the same value.
+        small = cv2.resize(self.pixels, (32, 32), interpolation=cv2.INTER_AREA)
+        dct = cv2.dct(small.astype(np.float32))[:8, :8]
+        bits = (dct > np.median(dct.flatten()[1:])).flatten()
+        return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+    def encode_jpeg(self, quality: int = 75) -> bytes:
+        ok, buf = cv2.imencode(
+            ".jpg", self.pixels, [int(cv2.IMWRITE_JPEG_QUALITY), quality]
         )
+        if not ok:
+            raise ValueError(f"JPEG encoding failed for {self.name}")
+        return buf.tobytes()
 
-    output_dir = Path("tmp/output/pages")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    img_path = output_dir / f"{Path(pdf_path).stem}_page_{page_num}.jpg"
-    cv2.imwrite(str(img_path), img_gray, [int(cv2.IMWRITE_JPEG_QUALITY), 75])
 
-    doc.close()
-    return str(img_path)
+def render_page_to_image(pdf_path: str, page_num: int, dpi: int = 96) -> PageImage:
+    ctx = get_document_context(pdf_path)
+    cached = ctx.page_images.get((page_num, dpi))
+    if cached is not None:
+        return cached
 
+    page = ctx.fitz_page(page_num)
 
-def preprocess_for_vision(image_path: str) -> str:
-    img = cv2.imread(image_path)
-    if img is None:
-        return image_path
+    zoom = dpi / 72.0
+    mat = fitz.Matrix(zoom, zoom)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+
+    img_gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+
+    image = PageImage(img_gray, f"{Path(pdf_path).stem}_page_{page_num}")
+    ctx.page_images[(page_num, dpi)] = image
+    return image
 
-    h, w = img.shape[:2]
+
+def preprocess_for_vision(image: PageImage) -> PageImage:
+    h, w = image.height, image.width
 
     scale = 900 / max(h, w)
-    if scale < 1.0:
-        img = cv2.resize(
-            img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA
-        )
+    if scale >= 1.0:
+        return image
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    jpeg_path = os.path.splitext(image_path)[0] + "_vision.jpg"
-    cv2.imwrite(jpeg_path, gray, [int(cv2.IMWRITE_JPEG_QUALITY), 50])
-    return jpeg_path
+    resized = cv2.resize(
+        image.pixels, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA
+    )
+    return PageImage(resized, f"{image.name}_vision")
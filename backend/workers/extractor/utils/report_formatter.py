@@ -1,28 +1,185 @@
+import asyncio
+import hashlib
 import json
 import os
 import re
-import time
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List
 from rich import print
-from backend.workers.extractor.utils.compressor import llm_friendly_compress
-from backend.workers.extractor.utils.prompt_builder import build_financial_prompt
-from backend.workers.extractor.openai_client import openai_client
+from backend.workers.extractor.config.settings import get_settings
+from backend.workers.extractor.utils.compressor import (
+    llm_friendly_compress,
+    preselect_pages,
+)
+from backend.workers.extractor.utils.jsonl import iter_jsonl
+from backend.workers.extractor.utils.prompt_builder import (
+    PROMPT_VERSION,
+    build_financial_prompt,
+    build_repair_prompt,
+    build_section_prompt,
+    report_date,
+    SECTION_QUERIES,
+)
+from backend.workers.extractor.openai_client import async_openai_client
+from backend.workers.extractor.utils.result_cache import DiskCache, S3Cache, cache_key
+from backend.workers.extractor.utils.retrieval import PageIndex, top_pages
 from backend.workers.extractor.utils.validate_report_schema import (
-    validate_report_schema,
+    get_report_validator,
+    invalid_sections,
 )
 
 
-def generate_report(
-    parsed_json_path: str, company_name: str, model: str = "gpt-4o-mini"
+MAX_SECTION_REPAIRS = 2
+
+
+@lru_cache
+def get_report_cache() -> DiskCache | S3Cache | None:
+    settings = get_settings()
+    ttl_seconds = settings.report_cache_ttl_hours * 3600
+    if settings.report_cache_backend == "disk":
+        return DiskCache(
+            settings.report_cache_dir,
+            max_entries=settings.report_cache_max_entries,
+            max_bytes=settings.report_cache_max_mb * 1024 * 1024,
+            ttl_seconds=ttl_seconds,
+        )
+    if settings.report_cache_backend == "s3":
+        return S3Cache(settings.api_base_url, "reports", ttl_seconds=ttl_seconds)
+    return None
+
+
+def report_cache_key(context: str, model: str) -> str:
+    context_hash = hashlib.sha256(context.encode("utf-8")).hexdigest()
+    return cache_key("report", context_hash, PROMPT_VERSION, model)
+
+
+def load_parsed_pages(
+    parsed_json_path: str, token_budget: int, model: str
+) -> List[Dict[str, Any]]:
+    if not parsed_json_path.endswith(".jsonl"):
+        with open(parsed_json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    pages = iter_jsonl(parsed_json_path)
+    if not token_budget:
+        return list(pages)
+    # Keep twice the budget so dedup and ranking still have room to choose
+    return preselect_pages(pages, 2 * token_budget, model)
+
+
+async def generate_report(
+    parsed_json_path: str,
+    company_name: str,
+    model: str = "gpt-4o-mini",
+    use_cache: bool = True,
+    output_dir: str = "tmp/output",
 ) -> str:
     if not os.path.exists(parsed_json_path):
         raise FileNotFoundError(parsed_json_path)
 
-    with open(parsed_json_path, "r", encoding="utf-8") as f:
-        parsed_data = json.load(f)
+    settings = get_settings()
+    parsed_data = await asyncio.to_thread(
+        load_parsed_pages, parsed_json_path, settings.context_token_budget, model
+    )
 
     print("[cyan]Building context for OpenAI...[/cyan]")
-    context = llm_friendly_compress(parsed_data)
+    # Off the event loop so concurrent jobs keep their broker heartbeats
+    context = await asyncio.to_thread(
+        llm_friendly_compress,
+        parsed_data,
+        settings.context_token_budget or None,
+        model,
+    )
+
+    mode = settings.report_generation_mode
+    cache = get_report_cache() if use_cache else None
+    key = report_cache_key(f"{mode}\n{company_name}\n{context}", model)
+
+    report = None
+    if cache is not None and not settings.report_cache_bypass:
+        report = await cache.aget(key)
+        if report is not None:
+            print(f"[green]Report cache hit ({key[:12]}) — skipping LLM call[/green]")
+            # The prompt stamps today's date; keep cached reports current.
+            report.setdefault("report_meta", {})["report_date"] = report_date()
+
+    if report is None:
+        if mode == "sections":
+            report = await request_report_by_section(
+                parsed_data, context, company_name, model
+            )
+        else:
+            report = await request_report(context, company_name, model)
+        if cache is not None and "error" not in report:
+            await cache.aset(key, report)
+
+    if cache is not None:
+        print(f"Report cache: {cache.stats.summary()}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    out_path = os.path.join(output_dir, "final_report.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"[green]Structured report saved to {out_path}[/green]")
+    return out_path
+
+
+async def complete_json(prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
+    resp = await async_openai_client.chat.completions.create(
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a financial analyst producing structured equity reports.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0,
+        seed=42,
+        top_p=1,
+        max_tokens=max_tokens,
+    )
+
+    raw_output = resp.choices[0].message.content
+    if not raw_output:
+        raise ValueError("Empty response from OpenAI.")
+
+    parsed = try_fix_json(raw_output)
+    if not isinstance(parsed, dict):
+        raise ValueError("Parsed report is not a valid dict.")
+    return parsed
+
+
+async def repair_sections(
+    report: Dict[str, Any],
+    errors: Dict[str, List[str]],
+    context: str,
+    company_name: str,
+    model: str,
+) -> Dict[str, List[str]]:
+    for attempt in range(MAX_SECTION_REPAIRS):
+        if not errors or "*" in errors:
+            break
+
+        print(
+            f"[yellow]Repairing sections {', '.join(sorted(errors))} "
+            f"(attempt {attempt+1})...[/yellow]"
+        )
+        patch = await complete_json(
+            build_repair_prompt(context, company_name, errors), model, 1500
+        )
+        for section in errors:
+            if section in patch:
+                report[section] = patch[section]
+        errors = invalid_sections(report)
+
+    return errors
+
+
+async def request_report(
+    context: str, company_name: str, model: str = "gpt-4o-mini"
+) -> Dict[str, Any]:
     prompt = build_financial_prompt(context, company_name)
 
     for attempt in range(5):
@@ -30,52 +187,99 @@ def generate_report(
             print(
                 f"[yellow]Requesting structured report (attempt {attempt+1})...[/yellow]"
             )
+            report = await complete_json(prompt, model, 4000)
 
-            resp = openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a financial analyst producing structured equity reports.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0,
-                seed=42,
-                top_p=1,
-                max_tokens=4000,
-            )
-
-            raw_output = resp.choices[0].message.content
-            if not raw_output:
-                raise ValueError("Empty response from OpenAI.")
-
-            report = try_fix_json(raw_output)
-            if not isinstance(report, dict):
-                raise ValueError("Parsed report is not a valid dict.")
-
-            if not validate_report_schema(report):
+            # Only the failing top-level sections are re-requested; a full
+            # regeneration is the fallback when repairs don't converge.
+            errors = invalid_sections(report)
+            errors = await repair_sections(report, errors, context, company_name, model)
+            if errors:
                 print(
-                    "[yellow]Report JSON failed schema validation. Retrying...[/yellow]"
+                    "[yellow]Report JSON failed schema validation "
+                    f"({', '.join(sorted(errors))}). Retrying...[/yellow]"
                 )
                 continue
-            else:
-                break
+
+            print("Report is valid according to schema.")
+            return report
 
         except Exception as e:
             wait = min(2**attempt, 30)
             print(f"[red]API error: {e} (retrying in {wait}s)[/red]")
-            time.sleep(wait)
-    else:
-        report = {"error": "All retries failed."}
+            await asyncio.sleep(wait)
 
-    os.makedirs("tmp/output", exist_ok=True)
-    out_path = "tmp/output/final_report.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    return {"error": "All retries failed."}
 
-    print(f"[green]Structured report saved to {out_path}[/green]")
-    return out_path
+
+async def request_section(
+    section: str,
+    parsed_data: List[Dict[str, Any]],
+    index: PageIndex,
+    company_name: str,
+    model: str,
+) -> Any:
+    settings = get_settings()
+    query = SECTION_QUERIES.get(section, section)
+    pages = top_pages(parsed_data, query, k=settings.section_top_pages, index=index)
+    context = await asyncio.to_thread(
+        llm_friendly_compress,
+        pages or parsed_data,
+        settings.section_token_budget or None,
+        model,
+    )
+    prompt = build_section_prompt(section, context, company_name)
+
+    for attempt in range(3):
+        try:
+            patch = await complete_json(prompt, model, 1500)
+            value = patch.get(section)
+            if value is not None and not invalid_sections({section: value}).get(
+                section
+            ):
+                return value
+            print(f"[yellow]Section {section} failed validation, retrying...[/yellow]")
+        except Exception as e:
+            wait = min(2**attempt, 30)
+            print(f"[red]Section {section} API error: {e} (retrying in {wait}s)[/red]")
+            await asyncio.sleep(wait)
+    return None
+
+
+async def request_report_by_section(
+    parsed_data: List[Dict[str, Any]],
+    context: str,
+    company_name: str,
+    model: str = "gpt-4o-mini",
+) -> Dict[str, Any]:
+    sections = list(get_report_validator().schema["required"])
+    print(
+        f"[yellow]Requesting {len(sections)} report sections concurrently...[/yellow]"
+    )
+
+    index = await asyncio.to_thread(PageIndex.from_pages, parsed_data)
+    values = await asyncio.gather(
+        *(request_section(s, parsed_data, index, company_name, model) for s in sections)
+    )
+    report = {s: v for s, v in zip(sections, values) if v is not None}
+
+    # Sections that still fail get targeted repairs against the full context
+    # before falling back to the monolithic prompt.
+    try:
+        errors = await repair_sections(
+            report, invalid_sections(report), context, company_name, model
+        )
+    except Exception as e:
+        print(f"[red]Section repair failed: {e}[/red]")
+        errors = invalid_sections(report)
+    if errors:
+        print(
+            f"[yellow]Sectioned report incomplete ({', '.join(sorted(errors))}); "
+            "falling back to a single prompt[/yellow]"
+        )
+        return await request_report(context, company_name, model)
+
+    print("Report is valid according to schema.")
+    return report
 
 
 def try_fix_json(raw: str) -> Dict[str, Any]:
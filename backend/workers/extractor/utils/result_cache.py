@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+import aiohttp
+from backend.workers.extractor.utils.api import (
+    create_cache_upload,
+    fetch_cache_download,
+)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"hits={self.hits} misses={self.misses} ({rate:.0f}% hit rate), "
+            f"writes={self.writes}, evictions={self.evictions}"
+        )
+
+
+def cache_key(*parts: str) -> str:
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    def __init__(
+        self,
+        directory: str | Path,
+        max_entries: int = 5000,
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl_seconds: Optional[int] = None,
+    ):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._index: Optional[dict[str, tuple[float, int]]] = None
+        # get/set run on to_thread workers; guards _index and eviction
+        self._lock = threading.RLock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> dict[str, tuple[float, int]]:
+        if self._index is None:
+            self._index = {}
+            if self.directory.exists():
+                for path in self.directory.glob("*/*.json"):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    self._index[path.stem] = (st.st_mtime, st.st_size)
+        return self._index
+
+    def get(self, key: str, accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            created, value = entry["created"], entry["value"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.stats.misses += 1
+            return None
+
+        if self.ttl_seconds is not None and time.time() - created > self.ttl_seconds:
+            self.stats.misses += 1
+            return None
+
+        if accept is not None and not accept(value):
+            self.stats.misses += 1
+            return None
+
+        # mtime doubles as the LRU clock
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index[key] = (now, index[key][1])
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"created": time.time(), "value": value}
+        payload = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        # Unique per writer so concurrent sets of one key never share a file
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._load_index()[key] = (time.time(), len(payload))
+            self.stats.writes += 1
+            self._evict()
+
+    def _evict(self):
+        # Callers hold self._lock
+        index = self._load_index()
+        total_bytes = sum(size for _, size in index.values())
+        if len(index) <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        for key, (_, size) in sorted(index.items(), key=lambda kv: kv[1][0]):
+            if len(index) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+            del index[key]
+            total_bytes -= size
+            self.stats.evictions += 1
+
+    async def aget(self, key: str) -> Any:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any):
+        await asyncio.to_thread(self.set, key, value)
+
+
+class S3Cache:
+    # Entries live in the report bucket behind the API's /cache routes; size
+    # limits are left to the bucket's lifecycle rules.
+    def __init__(
+        self, api_base_url: str, namespace: str, ttl_seconds: Optional[int] = None
+    ):
+        self.api_base_url = api_base_url
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+    async def aget(self, key: str) -> Any:
+        try:
+            download_url = await fetch_cache_download(
+                self.api_base_url, self.namespace, key, self.ttl_seconds
+            )
+            if download_url is None:
+                self.stats.misses += 1
+                return None
+
+            async with aiohttp.ClientSession() as session:
+                async with session.get(download_url) as resp:
+                    if resp.status != 200:
+                        raise RuntimeError(f"Cache download failed: {resp.status}")
+                    value = json.loads(await resp.read())
+        except Exception as e:
+            print(f"S3 cache read failed for {key[:12]}: {e}")
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return value
+
+    async def aset(self, key: str, value: Any):
+        try:
+            upload_url = await create_cache_upload(
+                self.api_base_url, self.namespace, key
+            )
+            async with aiohttp.ClientSession() as session:
+                resp = await session.put(
+                    upload_url,
+                    data=json.dumps(value, ensure_ascii=False).encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                )
+                if resp.status not in (200, 201):
+                    text = await resp.text()
+                    raise RuntimeError(f"Upload failed: {resp.status} - {text}")
+            self.stats.writes += 1
+        except Exception as e:
+            print(f"S3 cache write failed for {key[:12]}: {e}")
@@ -0,0 +1,94 @@
+import json
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+
+
+TOKEN_PATTERN = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def page_document(page: Dict[str, Any]) -> str:
+    parts = [page.get("text") or "", page.get("ocr_text") or page.get("ocr") or ""]
+
+    for table_info in page.get("tables") or page.get("table_infos") or []:
+        parts.extend(table_info.get("headers", []))
+        for column in table_info.get("columns", []):
+            parts.extend(str(cell) for cell in column)
+
+    chart_data = page.get("chart_json")
+    if chart_data:
+        parts.append(
+            chart_data
+            if isinstance(chart_data, str)
+            else json.dumps(chart_data, ensure_ascii=False)
+        )
+
+    return "\n".join(p for p in parts if p)
+
+
+class PageIndex:
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+
+        rows, cols = [], []
+        for doc_id, document in enumerate(documents):
+            for term in tokenize(document):
+                rows.append(doc_id)
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+
+        # duplicate (doc, term) entries are summed into term frequencies
+        self.term_freqs = sparse.csc_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(documents), len(self.vocabulary)),
+        )
+        self.term_freqs.sum_duplicates()
+
+        n_docs = len(documents)
+        doc_freqs = np.diff(self.term_freqs.indptr)
+        self.idf = np.log1p((n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+
+        doc_lengths = np.asarray(self.term_freqs.sum(axis=1)).ravel()
+        avg_length = doc_lengths.mean() if n_docs else 0.0
+        self.length_norm = k1 * (1 - b + b * doc_lengths / max(avg_length, 1.0))
+
+    @classmethod
+    def from_pages(cls, parsed_data: Sequence[Dict[str, Any]]) -> "PageIndex":
+        return cls([page_document(page) for page in parsed_data])
+
+    def scores(self, query: str) -> np.ndarray:
+        terms = [
+            self.vocabulary[t] for t in set(tokenize(query)) if t in self.vocabulary
+        ]
+        if not terms:
+            return np.zeros(self.term_freqs.shape[0], dtype=np.float32)
+
+        tf = self.term_freqs[:, terms].toarray()
+        weighted = tf * (self.k1 + 1) / (tf + self.length_norm[:, None])
+        return weighted @ self.idf[terms]
+
+    def search(self, query: str, k: int = 12) -> List[Tuple[int, float]]:
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(i), float(scores[i])) for i in best if scores[i] > 0]
+
+
+def top_pages(
+    parsed_data: List[Dict[str, Any]],
+    query: str,
+    k: int = 12,
+    index: PageIndex | None = None,
+) -> List[Dict[str, Any]]:
+    index = index or PageIndex.from_pages(parsed_data)
+    hits = sorted(doc_id for doc_id, _ in index.search(query, k))
+    return [parsed_data[doc_id] for doc_id in hits]
@@ -3,17 +3,63 @@ import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="camelot")
 
 import camelot.io as camelot
-import os
 import pandas as pd
 import re
-from typing import List, Dict
-import pdfplumber
+from typing import Callable, List, Dict, TypedDict
+from backend.workers.extractor.utils.document_context import (
+    DocumentContext,
+    get_document_context,
+)
+from backend.workers.extractor.utils.page_triage import (
+    has_ruling_grid,
+    is_plausible_table,
+)
+
+
+class TableInfo(TypedDict):
+    page: int
+    rows: int
+    cols: int
+    headers: List[str]
+    columns: List[List[str]]
+
+
+def unique_headers(headers: List[str]) -> List[str]:
+    # Same scheme as pandas' CSV reader: 0, 1, 0.1, 1.1
+    seen = set()
+    counts: Dict[str, int] = {}
+    result = []
+    for header in headers:
+        name = header
+        while name in seen:
+            counts[header] = counts.get(header, 0) + 1
+            name = f"{header}.{counts[header]}"
+        seen.add(name)
+        result.append(name)
+    return result
+
+
+def to_table_info(df: pd.DataFrame, page_number: int) -> TableInfo:
+    # Column-major lists of strings: cheap to pickle back from the page pool
+    # and serialised straight into the extract JSON, no CSV round-trip.
+    # Side-by-side merges repeat headers and pad the shorter table with NaN.
+    df = df.fillna("")
+    return {
+        "page": page_number,
+        "rows": len(df),
+        "cols": len(df.columns),
+        "headers": unique_headers([str(h).strip() for h in df.columns]),
+        "columns": [
+            [str(cell) for cell in df.iloc[:, i].tolist()]
+            for i in range(len(df.columns))
+        ],
+    }
 
 
 def is_probably_table(df: pd.DataFrame) -> bool:
     if df.shape[0] < 2 or df.shape[1] < 2:
         return False
-    values = " ".join(df.astype(str).fillna("").values.flatten())
+    values = " ".join(df.fillna("").astype(str).values.flatten())
     digits = len(re.findall(r"[\d%]", values))
     ratio = digits / max(len(values), 1)
     return ratio > 0.15
@@ -23,13 +69,20 @@ def clean_numeric_cells(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
 
-    df = df.astype(str).fillna("")
+    # find_tables and pdfplumber return None for empty cells
+    df = df.fillna("").astype(str)
     df = df.replace(r"(\d)\s*,\s*(\d)", r"\1\2", regex=True)
     df = df.replace(r"(\d)\s+(\d)", r"\1\2", regex=True)
     df = df.map(lambda x: str(x).strip())  # pyright: ignore[reportCallIssue]
     return df
 
 
+def drop_empty_lines(df: pd.DataFrame) -> pd.DataFrame:
+    # Runs on cleaned frames, where every empty cell is ""
+    filled = df != ""
+    return df.loc[filled.any(axis=1), filled.any(axis=0)]
+
+
 def merge_adjacent_tables(tables: List[pd.DataFrame]) -> List[pd.DataFrame]:
     merged = []
     skip_next = False
@@ -55,89 +108,94 @@ def merge_adjacent_tables(tables: List[pd.DataFrame]) -> List[pd.DataFrame]:
     return merged
 
 
-def extract_tables_from_page(
-    pdf_path: str, page_number: int, output_dir: str = "tmp/output/tables"
-) -> List[Dict[str, str]]:
-    os.makedirs(output_dir, exist_ok=True)
-    tables_info: List[Dict[str, str]] = []
+def usable_tables(dfs: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    cleaned = []
+    for df in dfs:
+        df = drop_empty_lines(clean_numeric_cells(df))
+        if not is_probably_table(df):
+            continue
+        cleaned.append(df)
+    return merge_adjacent_tables(cleaned)
 
-    try:
-        lattice = camelot.read_pdf(pdf_path, pages=str(page_number), flavor="lattice")
-        stream = camelot.read_pdf(pdf_path, pages=str(page_number), flavor="stream")
-
-        def best_result(a, b):
-            if not a:
-                return b
-            if not b:
-                return a
-            if a[0].df.shape[1] >= b[0].df.shape[1]:
-                return a
-            return b
 
-        results = best_result(lattice, stream)
-    except Exception as e:
-        print(f"Camelot failed on page {page_number}: {e}")
-        results = []
+def has_ruling_lines(ctx: DocumentContext, page_number: int) -> bool:
+    # Only a grid of rules counts; outlined text boxes and chart frames don't
+    return has_ruling_grid(ctx.drawings(page_number))
+
 
-    table_idx = 1
+def pymupdf_tables(ctx: DocumentContext, page_number: int) -> List[pd.DataFrame]:
     dfs = []
-    for t in results:
-        df = clean_numeric_cells(t.df)
-        if not is_probably_table(df):
-            continue
-        dfs.append(df)
+    for strategy in ("lines", "text"):
+        # Triage already ran the "lines" pass on table candidates
+        tables = ctx.tables(page_number, strategy)
+        dfs = usable_tables(
+            [pd.DataFrame(rows) for rows in tables if is_plausible_table(rows)]
+        )
+        if dfs:
+            break
+    return dfs
 
-    dfs = merge_adjacent_tables(dfs)  # refinement #2
 
-    for df in dfs:
-        csv_path = os.path.join(output_dir, f"page{page_number}_table{table_idx}.csv")
-        df.to_csv(csv_path, index=False)
-        tables_info.append(
-            {
-                "page": str(page_number),
-                "rows": str(len(df)),
-                "cols": str(len(df.columns)),
-                "path": csv_path,
-            }
-        )
-        table_idx += 1
+def camelot_tables(ctx: DocumentContext, page_number: int) -> List[pd.DataFrame]:
+    page_pdf = ctx.single_page_pdf(page_number)
+    lattice = camelot.read_pdf(page_pdf, pages="1", flavor="lattice")
+    stream = camelot.read_pdf(page_pdf, pages="1", flavor="stream")
+
+    def best_result(a, b):
+        if not a:
+            return b
+        if not b:
+            return a
+        if a[0].df.shape[1] >= b[0].df.shape[1]:
+            return a
+        return b
+
+    return usable_tables([t.df for t in best_result(lattice, stream)])
+
+
+def pdfplumber_tables(ctx: DocumentContext, page_number: int) -> List[pd.DataFrame]:
+    page = ctx.plumber_page(page_number)
+    tables = page.extract_tables(
+        {
+            "vertical_strategy": "lines",
+            "horizontal_strategy": "lines",
+            "intersection_tolerance": 5,
+            "snap_tolerance": 3,
+            "join_tolerance": 3,
+        }
+    )
+    return usable_tables([pd.DataFrame(t) for t in tables])
+
+
+TableEngine = Callable[[DocumentContext, int], List[pd.DataFrame]]
+
+TABLE_ENGINES: Dict[str, TableEngine] = {
+    "pymupdf": pymupdf_tables,
+    "camelot": camelot_tables,
+    "pdfplumber": pdfplumber_tables,
+}
+
 
-    if not tables_info:
+def extract_tables_from_page(
+    pdf_path: str,
+    page_number: int,
+    engine: str = "pymupdf",
+) -> List[TableInfo]:
+    ctx = get_document_context(pdf_path)
+
+    try:
+        dfs = TABLE_ENGINES[engine](ctx, page_number)
+    except Exception as e:
+        print(f"Table engine '{engine}' failed on page {page_number}: {e}")
+        dfs = []
+
+    # The fast engine misses ruled tables with merged or irregular cells; only
+    # then is it worth paying for camelot's lattice + stream passes.
+    if not dfs and engine != "camelot":
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                page = pdf.pages[page_number - 1]
-                tables = page.extract_tables(
-                    {
-                        "vertical_strategy": "lines",
-                        "horizontal_strategy": "lines",
-                        "intersection_tolerance": 5,
-                        "snap_tolerance": 3,
-                        "join_tolerance": 3,
-                    }
-                )
-                dfs_plumber = []
-                for t in tables:
-                    df = pd.DataFrame(t).dropna(how="all").dropna(axis=1, how="all")
-                    df = clean_numeric_cells(df)
-                    if not is_probably_table(df):
-                        continue
-                    dfs_plumber.append(df)
-                dfs_plumber = merge_adjacent_tables(dfs_plumber)
-                for df in dfs_plumber:
-                    csv_path = os.path.join(
-                        output_dir, f"page{page_number}_table{table_idx}.csv"
-                    )
-                    df.to_csv(csv_path, index=False)
-                    tables_info.append(
-                        {
-                            "page": str(page_number),
-                            "rows": str(len(df)),
-                            "cols": str(len(df.columns)),
-                            "path": csv_path,
-                        }
-                    )
-                    table_idx += 1
+            if has_ruling_lines(ctx, page_number):
+                dfs = camelot_tables(ctx, page_number)
         except Exception as e:
-            print(f"pdfplumber fallback failed on page {page_number}: {e}")
+            print(f"Camelot failed on page {page_number}: {e}")
 
-    return tables_info
+    return [to_table_info(df, page_number) for df in dfs]
@@ -1,12 +1,13 @@
+import codecs
 import logging
-import os
 import re
-from typing import TypedDict
-
-import pdfplumber
+from typing import Iterator, List, TypedDict
+import chardet
 
+from backend.workers.extractor.utils.document_context import get_document_context
 from backend.workers.extractor.utils.easyocr_fallback import extract_easyocr_text
 from backend.workers.extractor.utils.render_page import render_page_to_image
+from backend.workers.extractor.utils.token_counter import count_tokens
 
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
@@ -14,53 +15,136 @@ logging.getLogger("pdfminer").setLevel(logging.ERROR)
 class PageTextResult(TypedDict):
     page: int
     chars: int
-    path: str
     text: str
 
 
-def extract_text_from_pdf(
-    pdf_path: str, page_number: int, output_dir: str = "tmp/output/text"
-) -> PageTextResult:
-    os.makedirs(output_dir, exist_ok=True)
-
+def extract_text_from_pdf(pdf_path: str, page_number: int) -> PageTextResult:
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            if page_number < 1 or page_number > total_pages:
-                raise IndexError(f"Page {page_number} out of range (1–{total_pages})")
-
-            page = pdf.pages[page_number - 1]
-            text: str = page.extract_text() or ""
-            text = re.sub(r"\s+", " ", text).strip()
-
-            if len(text) < 50:
-                print(f"Page {page_number}: Low or no selectable text, running OCR…")
-                img_path = render_page_to_image(pdf_path, page_number)
-                ocr_result = extract_easyocr_text(img_path, visualize=False)
-                text = ocr_result.get("text", "").strip()
-
-            file_path = os.path.join(output_dir, f"page_{page_number}.txt")
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(text)
-
-            return {
-                "page": page_number,
-                "chars": len(text),
-                "path": file_path,
-                "text": text,
-            }
+        page = get_document_context(pdf_path).plumber_page(page_number)
+        text: str = page.extract_text() or ""
+        text = re.sub(r"\s+", " ", text).strip()
+
+        if len(text) < 50:
+            print(f"Page {page_number}: Low or no selectable text, running OCR…")
+            image = render_page_to_image(pdf_path, page_number)
+            ocr_result = extract_easyocr_text(image, visualize=False)
+            text = ocr_result.get("text", "").strip()
+
+        return {
+            "page": page_number,
+            "chars": len(text),
+            "text": text,
+        }
 
     except Exception as e:
         print(f"Failed to extract text from page {page_number}: {e}")
-        return {"page": page_number, "chars": 0, "path": "", "text": ""}
-
-
-def extract_text_from_txt(file_path: str):
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        text = f.read()
-    lines = text.splitlines()
-    chunks = ["\n".join(lines[i : i + 50]) for i in range(0, len(lines), 50)]
-    return [
-        {"page": i + 1, "text": chunk, "needs_vision": False}
-        for i, chunk in enumerate(chunks)
-    ]
+        return {"page": page_number, "chars": 0, "text": ""}
+
+
+class TextChunk(TypedDict):
+    page: int
+    text: str
+    needs_vision: bool
+
+
+def detect_encoding(file_path: str, sample_size: int = 64 * 1024) -> str:
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_size)
+
+    for bom, encoding in (
+        (codecs.BOM_UTF8, "utf-8-sig"),
+        (codecs.BOM_UTF16_LE, "utf-16"),
+        (codecs.BOM_UTF16_BE, "utf-16"),
+    ):
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        # a multibyte sequence may be cut at the sample edge
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        if e.start >= len(sample) - 3:
+            return "utf-8"
+
+    detected = chardet.detect(sample)
+    return detected.get("encoding") or "utf-8"
+
+
+def iter_paragraphs(
+    file_path: str,
+    encoding: str,
+    max_line_chars: int = 16 * 1024,
+    max_paragraph_chars: int = 64 * 1024,
+) -> Iterator[str]:
+    lines: List[str] = []
+    size = 0
+    with open(file_path, "r", encoding=encoding, errors="replace") as f:
+        # bounded reads so a file without newlines can't pull itself into memory
+        for line in iter(lambda: f.readline(max_line_chars), ""):
+            if line.strip():
+                lines.append(line.rstrip())
+                size += len(line)
+                # transcripts may have no blank lines at all
+                if size < max_paragraph_chars:
+                    continue
+            if lines:
+                yield "\n".join(lines)
+                lines, size = [], 0
+    if lines:
+        yield "\n".join(lines)
+
+
+def split_to_budget(text: str, max_tokens: int) -> Iterator[tuple[str, int]]:
+    tokens = count_tokens(text)
+    if tokens <= max_tokens or len(text) < 2:
+        yield text, tokens
+        return
+
+    # halve at a space near the middle until every piece fits
+    middle = len(text) // 2
+    cut = text.rfind(" ", 0, middle)
+    if cut <= 0:
+        cut = middle
+    yield from split_to_budget(text[:cut], max_tokens)
+    yield from split_to_budget(text[cut:].lstrip(), max_tokens)
+
+
+def iter_txt_chunks(file_path: str, max_tokens: int = 800) -> Iterator[TextChunk]:
+    encoding = detect_encoding(file_path)
+    print(f"Reading {file_path} as {encoding}")
+
+    page = 1
+    parts: List[str] = []
+    tokens = 0
+    # ~4 chars per token, with headroom so most paragraphs arrive whole
+    for paragraph in iter_paragraphs(
+        file_path, encoding, max_paragraph_chars=max_tokens * 8
+    ):
+        paragraph_tokens = count_tokens(paragraph)
+
+        # An oversized paragraph is split on line boundaries instead, and an
+        # oversized line at spaces
+        pieces = [(paragraph, paragraph_tokens)]
+        if paragraph_tokens > max_tokens:
+            pieces = [
+                piece
+                for line in paragraph.split("\n")
+                for piece in split_to_budget(line, max_tokens)
+            ]
+
+        for piece, piece_tokens in pieces:
+            # the "\n\n" joining pieces costs about a token
+            if parts and tokens + 1 + piece_tokens > max_tokens:
+                yield {"page": page, "text": "\n\n".join(parts), "needs_vision": False}
+                page += 1
+                parts, tokens = [], 0
+            parts.append(piece)
+            tokens += piece_tokens + (1 if len(parts) > 1 else 0)
+
+    if parts:
+        yield {"page": page, "text": "\n\n".join(parts), "needs_vision": False}
+
+
+def extract_text_from_txt(file_path: str, max_tokens: int = 800) -> List[TextChunk]:
+    return list(iter_txt_chunks(file_path, max_tokens))
@@ -0,0 +1,27 @@
+import math
+from functools import lru_cache
+from rich import print
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"[yellow]tiktoken unavailable ({e}); estimating tokens[/yellow]")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # ~4 characters per token for English prose and figures
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text, disallowed_special=()))
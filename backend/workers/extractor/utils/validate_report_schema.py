@@ -1,18 +1,48 @@
 import json
-import jsonschema
-from jsonschema import ValidationError
+from functools import lru_cache
+from typing import Dict, List
+from jsonschema import Draft7Validator
+
+
+@lru_cache
+def get_report_validator() -> Draft7Validator:
+    with open("report_schema.json") as f:
+        schema = json.load(f)
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema)
+
+
+def invalid_sections(report: object) -> Dict[str, List[str]]:
+    validator = get_report_validator()
+    if not isinstance(report, dict):
+        return {"*": ["report is not a JSON object"]}
+
+    sections: Dict[str, List[str]] = {}
+    for error in validator.iter_errors(report):
+        if error.absolute_path:
+            section = str(error.absolute_path[0])
+            location = "/".join(str(p) for p in error.absolute_path)
+            sections.setdefault(section, []).append(f"{location}: {error.message}")
+        elif error.validator == "required":
+            # one error per missing key, each carrying the full required list
+            for section in error.validator_value:
+                if section not in report and section not in sections:
+                    sections[section] = ["section is missing"]
+        else:
+            sections.setdefault("*", []).append(error.message)
+    return sections
 
 
 def validate_report_schema(report: object) -> bool:
     try:
-        with open("report_schema.json") as f:
-            schema = json.load(f)
-        jsonschema.validate(instance=report, schema=schema)
-        print("Report is valid according to schema.")
-        return True
-    except ValidationError as e:
-        print(f"Schema validation failed: {e.message}")
-        return False
+        sections = invalid_sections(report)
     except Exception as e:
         print(f"Unexpected validation error: {e}")
         return False
+
+    if sections:
+        print(f"Schema validation failed for: {', '.join(sorted(sections))}")
+        return False
+
+    print("Report is valid according to schema.")
+    return True
@@ -12,6 +12,16 @@ class Settings(BaseSettings):
 
     api_base_url: str = Field(..., alias="API_BASE_URL")
 
+    max_concurrent_renders: int = Field(4, alias="MAX_CONCURRENT_RENDERS")
+    shutdown_grace_seconds: int = Field(60, alias="SHUTDOWN_GRACE_SECONDS")
+
+    browser_pool_size: int = Field(1, alias="BROWSER_POOL_SIZE")
+    browser_max_renders: int = Field(50, alias="BROWSER_MAX_RENDERS")
+    browser_max_rss_mb: int = Field(1024, alias="BROWSER_MAX_RSS_MB")
+
+    render_cache_enabled: bool = Field(True, alias="RENDER_CACHE_ENABLED")
+    render_cache_ttl_hours: int = Field(168, alias="RENDER_CACHE_TTL_HOURS")
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
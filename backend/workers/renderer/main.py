@@ -1,13 +1,31 @@
 import asyncio
+import math
 import aio_pika
+from backend.workers.scheduler import JobScheduler
 from backend.workers.renderer.config.settings import get_settings
 from backend.workers.renderer.process_message import process_message
+from backend.workers.renderer.utils.browser_pool import (
+    start_browser_pool,
+    shutdown_browser_pool,
+)
+from backend.workers.renderer.utils.template_assets import load_template_assets
 
 
 async def main():
     print("renderer worker starting...")
     settings = get_settings()
 
+    await start_browser_pool(
+        settings.browser_pool_size,
+        settings.browser_max_renders,
+        settings.browser_max_rss_mb,
+        # Charts are static SVG; only the CDN Tailwind fallback needs scripts
+        javascript=load_template_assets() is None,
+        contexts_per_browser=math.ceil(
+            settings.max_concurrent_renders / settings.browser_pool_size
+        ),
+    )
+
     connection = await aio_pika.connect_robust(
         settings.rabbitmq_url,
         timeout=15,
@@ -15,9 +33,13 @@ async def main():
         reconnect_interval=5,
     )
 
+    scheduler = JobScheduler(
+        process_message, settings.max_concurrent_renders, label="render"
+    )
+
     async with connection:
         channel = await connection.channel()
-        await channel.set_qos(prefetch_count=1)
+        await channel.set_qos(prefetch_count=settings.max_concurrent_renders)
 
         exchange = await channel.declare_exchange(
             settings.rabbitmq_exchange, aio_pika.ExchangeType.DIRECT, durable=True
@@ -26,13 +48,23 @@ async def main():
         queue = await channel.declare_queue("renderer", durable=True)
         await queue.bind(exchange, routing_key="renderer")
 
-        await queue.consume(process_message, no_ack=False)
-        print("Listening on 'renderer' queue...")
+        consumer_tag = await queue.consume(scheduler.submit, no_ack=False)
+        print(
+            f"Listening on 'renderer' queue "
+            f"(max {settings.max_concurrent_renders} concurrent renders)..."
+        )
 
         try:
             await asyncio.Future()
         except asyncio.CancelledError:
             print("Graceful shutdown requested.")
+        finally:
+            try:
+                await queue.cancel(consumer_tag)
+            except Exception as e:
+                print(f"Failed to cancel consumer: {e}")
+            await scheduler.drain(settings.shutdown_grace_seconds)
+            await shutdown_browser_pool()
 
 
 if __name__ == "__main__":
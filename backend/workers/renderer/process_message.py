@@ -3,19 +3,25 @@ import json
 from backend.workers.renderer.render_job import render_job
 
 
-async def process_message(message: AbstractIncomingMessage):
+async def process_message(message: AbstractIncomingMessage) -> None:
     try:
         payload = json.loads(message.body)
         print(f"Received message: {payload}")
+        report_id = payload["report_id"]
+        file_id = payload["file_id"]
+    except Exception as e:
+        # A malformed payload will never succeed; drop it instead of looping.
+        print(f"Rejecting unprocessable message: {e}")
+        await message.reject(requeue=False)
+        return
 
-        await message.ack()
-
-        await render_job(payload["report_id"], payload["file_id"])
-        print(f"Successfully processed {payload}")
+    # A redelivered message belongs to a render that crashed or was
+    # cancelled; the job takes over the output record it left in progress.
+    if message.redelivered:
+        print(f"Message for report {report_id} was redelivered; rendering again")
 
-    except Exception as e:
-        print(f"Error processing message: {e}")
-        try:
-            await message.ack()
-        except Exception as ack_err:
-            print(f"Failed to ack message after error: {ack_err}")
+    # render_job records its own failures on the output file, so reaching
+    # this point means the job is finished one way or another.
+    await render_job(report_id, file_id, resume=message.redelivered)
+    await message.ack()
+    print(f"Successfully processed {payload}")
@@ -1,5 +1,6 @@
 import multiprocessing as mp
 import shutil
+import uuid
 from pathlib import Path
 from typing import Optional
 from backend.workers.renderer.config.settings import get_settings
@@ -18,11 +19,12 @@ from backend.workers.renderer.utils.report_generator import generate_report
 mp.set_start_method("spawn", force=True)
 
 
-async def render_job(report_id: int, extract_file_id: int):
+async def render_job(report_id: int, extract_file_id: int, resume: bool = False):
     print(f"Starting renderer for report {report_id}, extract file {extract_file_id}")
 
     settings = get_settings()
-    tmp_root = Path("tmp")
+    # Per-job workspace: other renders share this process and its cwd
+    tmp_root = Path("tmp") / f"render_{report_id}_{uuid.uuid4().hex[:8]}"
     downloads_dir = tmp_root / "downloads"
     output_dir = tmp_root / "output"
     downloads_dir.mkdir(parents=True, exist_ok=True)
@@ -46,6 +48,7 @@ async def render_job(report_id: int, extract_file_id: int):
             report_id,
             FileType.pdf,
             FileCategory.output,
+            resume=resume,
         )
         output_file_id = upload_info["file_id"]
 
@@ -56,7 +59,7 @@ async def render_job(report_id: int, extract_file_id: int):
 
         print("Generating formatted PDF report...")
         try:
-            pdf_path = await generate_report(str(json_path))
+            pdf_path = await generate_report(str(json_path), output_dir)
             print(f"PDF generated at {pdf_path}")
         except Exception as e:
             raise RuntimeError(f"Report generation failed: {e}")
@@ -94,6 +97,6 @@ async def render_job(report_id: int, extract_file_id: int):
     finally:
         try:
             shutil.rmtree(tmp_root, ignore_errors=True)
-            print("Cleanup complete.")
+            print(f"Cleaned up {tmp_root}")
         except Exception as e:
             print(f"Cleanup failed: {e}")
@@ -0,0 +1,267 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from playwright.async_api import (
+    Browser,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+
+def _process_table() -> dict[int, int]:
+    table = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # comm may contain spaces; fields after the closing paren are fixed
+        ppid = int(stat[stat.rfind(")") + 2 :].split()[1])
+        table[int(entry.name)] = ppid
+    return table
+
+
+def _descendants(root: int, table: dict[int, int]) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for pid, ppid in table.items():
+        children.setdefault(ppid, []).append(pid)
+
+    found, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        found.append(pid)
+        stack.extend(children.get(pid, []))
+    return found
+
+
+def _rss_mb(pids: list[int]) -> float:
+    total_kb = 0
+    for pid in pids:
+        try:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+                    break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def _browser_pids() -> set[int]:
+    # Browsers are children of the Playwright driver, which is our child.
+    if not Path("/proc").exists():
+        return set()
+    table = _process_table()
+    drivers = {pid for pid, ppid in table.items() if ppid == os.getpid()}
+    return {pid for pid, ppid in table.items() if ppid in drivers}
+
+
+class BrowserSlot:
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.browser: Optional[Browser] = None
+        self.pid: Optional[int] = None
+        self.renders = 0
+        self.active = 0
+        self.retire_reason: Optional[str] = None
+        self.recycling = False
+
+    def healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    def rss_mb(self) -> float:
+        if self.pid is None:
+            return 0.0
+        return _rss_mb(_descendants(self.pid, _process_table()))
+
+    def needs_recycle(self) -> bool:
+        return not self.healthy() or self.retire_reason is not None
+
+
+class BrowserPool:
+    # Each job gets its own context (cookies, storage, cache) on a shared
+    # browser; a browser due for recycling stops taking new jobs and is
+    # relaunched once its running jobs have finished.
+    def __init__(
+        self,
+        size: int = 1,
+        max_renders: int = 50,
+        max_rss_mb: int = 1024,
+        javascript: bool = False,
+        contexts_per_browser: int = 1,
+    ):
+        self.size = size
+        self.max_renders = max_renders
+        self.max_rss_mb = max_rss_mb
+        self.javascript = javascript
+        self.contexts_per_browser = contexts_per_browser
+        self._playwright: Optional[Playwright] = None
+        self._slots: list[BrowserSlot] = []
+        self._changed = asyncio.Condition()
+        self._launch_lock = asyncio.Lock()
+        self.launches = 0
+        self.recycles = 0
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        for slot_id in range(self.size):
+            slot = BrowserSlot(slot_id)
+            await self._launch(slot)
+            self._slots.append(slot)
+        print(
+            f"Browser pool ready ({self.size} browser(s) x "
+            f"{self.contexts_per_browser} context(s), "
+            f"JavaScript {'on' if self.javascript else 'off'})"
+        )
+
+    async def _launch(self, slot: BrowserSlot):
+        assert self._playwright is not None, "browser pool not started"
+        # One launch at a time so the new browser's pid can be told apart
+        async with self._launch_lock:
+            before = _browser_pids()
+            slot.browser = await self._playwright.chromium.launch()
+            new_pids = _browser_pids() - before
+        slot.pid = new_pids.pop() if len(new_pids) == 1 else None
+        slot.renders = 0
+        self.launches += 1
+
+    async def _close(self, slot: BrowserSlot):
+        try:
+            if slot.browser is not None:
+                await slot.browser.close()
+        except Exception as e:
+            print(f"Failed to close browser {slot.slot_id}: {e}")
+        slot.browser = None
+        slot.pid = None
+
+    async def _recycle(self, slot: BrowserSlot):
+        reason = slot.retire_reason or "browser disconnected"
+        print(f"Recycling browser {slot.slot_id}: {reason}")
+        try:
+            await self._close(slot)
+            await self._launch(slot)
+            self.recycles += 1
+        finally:
+            async with self._changed:
+                slot.recycling = False
+                slot.retire_reason = None
+                self._changed.notify_all()
+
+    def _retire_reason(self, slot: BrowserSlot) -> Optional[str]:
+        if not slot.healthy():
+            return "browser disconnected"
+        if slot.renders >= self.max_renders:
+            return f"{slot.renders} renders"
+        if self.max_rss_mb and slot.rss_mb() > self.max_rss_mb:
+            return f"RSS above {self.max_rss_mb} MB"
+        return None
+
+    def _least_loaded(self) -> Optional[BrowserSlot]:
+        candidates = [
+            s
+            for s in self._slots
+            if not s.recycling
+            and not s.needs_recycle()
+            and s.active < self.contexts_per_browser
+        ]
+        return min(candidates, key=lambda s: s.active, default=None)
+
+    async def _acquire(self) -> BrowserSlot:
+        while True:
+            async with self._changed:
+                stale = next(
+                    (
+                        s
+                        for s in self._slots
+                        if s.needs_recycle() and not s.active and not s.recycling
+                    ),
+                    None,
+                )
+                if stale is None:
+                    slot = self._least_loaded()
+                    if slot is not None:
+                        slot.active += 1
+                        return slot
+                    await self._changed.wait()
+                    continue
+                stale.recycling = True
+            await self._recycle(stale)
+
+    async def _release(self, slot: BrowserSlot):
+        async with self._changed:
+            slot.active -= 1
+            slot.renders += 1
+            if slot.retire_reason is None:
+                slot.retire_reason = self._retire_reason(slot)
+            self._changed.notify_all()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        slot = await self._acquire()
+        try:
+            assert slot.browser is not None
+            context = await slot.browser.new_context(
+                java_script_enabled=self.javascript
+            )
+            try:
+                yield await context.new_page()
+            finally:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+        finally:
+            await self._release(slot)
+
+    async def stop(self):
+        for slot in self._slots:
+            await self._close(slot)
+        self._slots.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = asyncio.Lock()
+
+
+async def start_browser_pool(
+    size: int = 1,
+    max_renders: int = 50,
+    max_rss_mb: int = 1024,
+    javascript: bool = False,
+    contexts_per_browser: int = 1,
+) -> BrowserPool:
+    global _browser_pool
+    async with _browser_pool_lock:
+        if _browser_pool is None:
+            pool = BrowserPool(
+                size, max_renders, max_rss_mb, javascript, contexts_per_browser
+            )
+            await pool.start()
+            _browser_pool = pool
+    return _browser_pool
+
+
+async def get_browser_pool() -> BrowserPool:
+    if _browser_pool is not None:
+        return _browser_pool
+    return await start_browser_pool()
+
+
+async def shutdown_browser_pool():
+    global _browser_pool
+    async with _browser_pool_lock:
+        if _browser_pool is not None:
+            await _browser_pool.stop()
+            print(
+                f"Browser pool stopped ({_browser_pool.launches} launches, "
+                f"{_browser_pool.recycles} recycles)"
+            )
+            _browser_pool = None
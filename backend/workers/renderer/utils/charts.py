@@ -0,0 +1,162 @@
+import math
+from html import escape
+from typing import Any, Dict, List, Optional
+
+
+WIDTH = 340
+HEIGHT = 200
+PLOT_LEFT = 44
+PLOT_RIGHT = 8
+PLOT_TOP = 20
+PLOT_BOTTOM = 24
+BAR_WIDTH = 28
+FONT = "Fira Sans, sans-serif"
+
+QUARTERLY_CHARTS = {
+    "revenueChart": "Sales",
+    "ebitdaChart": "EBITDA",
+    "patChart": "PAT",
+    "marginChart": "Margin (%)",
+}
+
+
+def parse_number(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def format_number(value: float) -> str:
+    text = f"{value:,.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def nice_step(span: float, count: int) -> float:
+    raw = span / max(count, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 2.5, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def axis_ticks(values: List[float], count: int = 5) -> List[float]:
+    # Bars start at zero, so the axis always spans it
+    low = min([0.0, *values])
+    high = max([0.0, *values])
+    if low == high:
+        high = 1.0
+
+    step = nice_step(high - low, count)
+    start = math.floor(low / step) * step
+    stop = math.ceil(high / step) * step
+    return [start + i * step for i in range(round((stop - start) / step) + 1)]
+
+
+def quarterly_series(
+    quarterly: Dict[str, Any], metric: str
+) -> tuple[List[str], List[Optional[float]], List[Optional[float]]]:
+    columns = [str(c) for c in quarterly.get("columns") or []]
+    abs_idxs = [i for i, c in enumerate(columns) if "%" not in c]
+    qoq_idxs = [i for i, c in enumerate(columns) if "QoQ%" in c]
+
+    row = next(
+        (r for r in quarterly.get("rows") or [] if r.get("metric") == metric), {}
+    )
+    raw = row.get("values") or []
+    at = lambda i: parse_number(raw[i]) if i < len(raw) else None
+
+    values = [at(i) for i in abs_idxs]
+    growth = [at(i) for i in qoq_idxs]
+    if all(g is None for g in growth):
+        growth = [
+            (
+                None
+                if i == 0 or v is None or not values[i - 1]
+                else (v - values[i - 1]) / values[i - 1] * 100
+            )
+            for i, v in enumerate(values)
+        ]
+    return [columns[i] for i in abs_idxs], values, growth
+
+
+def bar_chart_svg(
+    labels: List[str],
+    values: List[Optional[float]],
+    growth: List[Optional[float]],
+    color: str = "#3b82f6",
+) -> str:
+    present = [v for v in values if v is not None]
+    ticks = axis_ticks(present)
+    low, high = ticks[0], ticks[-1]
+
+    plot_width = WIDTH - PLOT_LEFT - PLOT_RIGHT
+    plot_height = HEIGHT - PLOT_TOP - PLOT_BOTTOM
+    y = lambda v: PLOT_TOP + (high - v) / (high - low) * plot_height
+    slot = plot_width / max(len(labels), 1)
+    bar_width = min(BAR_WIDTH, slot * 0.8)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" '
+        f'font-family="{FONT}" font-size="10" role="img">'
+    ]
+    for tick in ticks:
+        ty = y(tick)
+        parts.append(
+            f'<line x1="{PLOT_LEFT}" x2="{WIDTH - PLOT_RIGHT}" y1="{ty:.1f}" '
+            f'y2="{ty:.1f}" stroke="#f3f4f6"/>'
+            f'<text x="{PLOT_LEFT - 6}" y="{ty:.1f}" text-anchor="end" '
+            f'dominant-baseline="middle" fill="#6b7280">{format_number(tick)}</text>'
+        )
+
+    zero = y(0.0)
+    for i, label in enumerate(labels):
+        cx = PLOT_LEFT + slot * (i + 0.5)
+        parts.append(
+            f'<text x="{cx:.1f}" y="{HEIGHT - 8}" text-anchor="middle" '
+            f'fill="#6b7280">{escape(label)}</text>'
+        )
+
+        value = values[i] if i < len(values) else None
+        if value is None:
+            continue
+        top, bottom = sorted((y(value), zero))
+        radius = min(4, bar_width / 2, (bottom - top) / 2)
+        parts.append(
+            f'<rect x="{cx - bar_width / 2:.1f}" y="{top:.1f}" '
+            f'width="{bar_width:.1f}" height="{bottom - top:.1f}" '
+            f'rx="{radius:.1f}" fill="{color}"/>'
+            f'<text x="{cx:.1f}" y="{(top + bottom) / 2:.1f}" text-anchor="middle" '
+            f'dominant-baseline="middle" font-weight="600" fill="#fff">'
+            f"{format_number(value)}</text>"
+        )
+
+        change = growth[i] if i < len(growth) else None
+        if change is not None:
+            up = change >= 0
+            parts.append(
+                f'<text x="{cx:.1f}" y="{y(max(value, 0.0)) - 8:.1f}" '
+                f'text-anchor="middle" font-weight="bold" '
+                f'fill="{"#16a34a" if up else "#dc2626"}">'
+                f'{"▲" if up else "▼"} {abs(change):.1f}%</text>'
+            )
+
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def quarterly_charts(report_data: Dict[str, Any]) -> Dict[str, str]:
+    quarterly = (report_data.get("financial_highlights") or {}).get("quarterly")
+    if not isinstance(quarterly, dict):
+        print("Quarterly data missing; skipping charts")
+        return {}
+
+    charts = {}
+    for chart_id, metric in QUARTERLY_CHARTS.items():
+        labels, values, growth = quarterly_series(quarterly, metric)
+        charts[chart_id] = bar_chart_svg(labels, values, growth)
+    return charts
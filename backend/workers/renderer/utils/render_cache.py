@@ -0,0 +1,97 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+from backend.workers.renderer.config.settings import get_settings
+from backend.workers.renderer.utils.api import (
+    create_cache_upload,
+    download_file,
+    fetch_cache_download,
+    upload_pdf,
+)
+from backend.workers.renderer.utils.template_assets import template_version
+
+# Bump when chart drawing or PDF options change the output for the same data
+RENDER_VERSION = "1"
+
+
+@dataclass
+class RenderCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"hits={self.hits} misses={self.misses} ({rate:.0f}% hit rate), "
+            f"writes={self.writes}, errors={self.errors}"
+        )
+
+
+def render_cache_key(report_data: Any) -> str:
+    # The render timestamp would turn every cache into a same-day cache
+    if isinstance(report_data, dict):
+        report_data = {k: v for k, v in report_data.items() if k != "generated_on"}
+    normalized = json.dumps(
+        report_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    digest = hashlib.sha256(normalized.encode("utf-8"))
+    digest.update(f"|{template_version()}|{RENDER_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    # Rendered PDFs live in the report bucket behind the API's /cache routes
+    def __init__(
+        self, api_base_url: str, namespace: str, ttl_seconds: Optional[int] = None
+    ):
+        self.api_base_url = api_base_url
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.stats = RenderCacheStats()
+
+    async def fetch(self, key: str, dest_path: Path) -> bool:
+        try:
+            download_url = await fetch_cache_download(
+                self.api_base_url, self.namespace, key, self.ttl_seconds
+            )
+            if download_url is None:
+                self.stats.misses += 1
+                return False
+            await download_file(download_url, str(dest_path))
+        except Exception as e:
+            print(f"Render cache read failed for {key[:12]}: {e}")
+            self.stats.misses += 1
+            self.stats.errors += 1
+            return False
+
+        self.stats.hits += 1
+        return True
+
+    async def store(self, key: str, pdf_path: Path):
+        try:
+            upload_url = await create_cache_upload(
+                self.api_base_url, self.namespace, key
+            )
+            await upload_pdf(upload_url, str(pdf_path))
+            self.stats.writes += 1
+        except Exception as e:
+            print(f"Render cache write failed for {key[:12]}: {e}")
+            self.stats.errors += 1
+
+
+@lru_cache
+def get_render_cache() -> Optional[RenderCache]:
+    settings = get_settings()
+    if not settings.render_cache_enabled:
+        return None
+    return RenderCache(
+        settings.api_base_url,
+        "renders",
+        ttl_seconds=settings.render_cache_ttl_hours * 3600,
+    )
@@ -4,7 +4,13 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from playwright.async_api import async_playwright
+from backend.workers.renderer.utils.browser_pool import get_browser_pool
+from backend.workers.renderer.utils.charts import quarterly_charts
+from backend.workers.renderer.utils.render_cache import (
+    get_render_cache,
+    render_cache_key,
+)
+from backend.workers.renderer.utils.template_assets import load_template_assets
 
 
 TMP_ROOT = Path("tmp")
@@ -35,14 +41,16 @@ env.filters["safe_round"] = safe_round
 def render_html(report_data: dict) -> str:
     report_data["generated_on"] = datetime.now().strftime("%d %B %Y")
     return env.get_template("report.html").render(
-        report_data=report_data, **report_data
+        report_data=report_data,
+        assets=load_template_assets(),
+        charts=quarterly_charts(report_data),
+        **report_data,
     )
 
 
 async def render_to_pdf(html: str, output_path: Path):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
+    pool = await get_browser_pool()
+    async with pool.page() as page:
         await page.set_content(html, wait_until="load")
 
         await page.pdf(
@@ -70,21 +78,24 @@ async def render_to_pdf(html: str, output_path: Path):
                 </footer>
             """,
         )
-        await browser.close()
     return output_path
 
 
-async def generate_report(extracted_json_path: str | Path) -> str:
+async def generate_report(
+    extracted_json_path: str | Path, output_dir: str | Path = OUTPUT_DIR
+) -> str:
     extracted_json_path = Path(extracted_json_path)
     if not extracted_json_path.exists():
         raise FileNotFoundError(f"Input JSON not found: {extracted_json_path}")
 
     job_id = uuid.uuid4().hex[:8]
-    tmp_dir = TMP_ROOT / f"report_{job_id}"
+    output_dir = Path(output_dir)
+    tmp_dir = output_dir.parent / f"report_{job_id}"
 
     tmp_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
     pdf_path_tmp = tmp_dir / f"report_{job_id}.pdf"
-    final_path = OUTPUT_DIR / f"report_{job_id}.pdf"
+    final_path = output_dir / f"report_{job_id}.pdf"
 
     try:
         with extracted_json_path.open("r", encoding="utf-8") as f:
@@ -116,11 +127,27 @@ async def generate_report(extracted_json_path: str | Path) -> str:
 
         trace_bad_iterables(report_data)
 
-        html = render_html(report_data)
-        await render_to_pdf(html, pdf_path_tmp)
-
-        shutil.move(str(pdf_path_tmp), str(final_path))
-        print(f"PDF report generated at: {final_path}")
+        # Keyed before render_html stamps generated_on, which the template
+        # doesn't print; the date it shows, report_meta.report_date, comes
+        # from the extract and is part of the key.
+        cache = get_render_cache()
+        key = render_cache_key(report_data)
+
+        if cache is not None and await cache.fetch(key, pdf_path_tmp):
+            print(f"Render cache hit ({key[:12]}) — skipping Chromium")
+            shutil.move(str(pdf_path_tmp), str(final_path))
+        else:
+            html = render_html(report_data)
+            await render_to_pdf(html, pdf_path_tmp)
+
+            shutil.move(str(pdf_path_tmp), str(final_path))
+            print(f"PDF report generated at: {final_path}")
+            if cache is not None:
+                await cache.store(key, final_path)
+
+        if cache is not None:
+            # Fleet-wide hit rates are served by the API at /cache/stats
+            print(f"Render cache: {cache.stats.summary()}")
 
         return str(final_path)
 
@@ -0,0 +1,62 @@
+import base64
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, TypedDict
+
+
+TEMPLATE_PATH = Path("templates") / "report.html"
+ASSETS_DIR = TEMPLATE_PATH.parent / "assets"
+FONT_FILE_PATTERN = re.compile(r"fira-sans-latin-(\d{3})-normal\.woff2$")
+
+
+class TemplateAssets(TypedDict):
+    css: str
+
+
+def font_face_css(fonts_dir: Path) -> str:
+    rules = []
+    for font_path in sorted(fonts_dir.glob("*.woff2")):
+        match = FONT_FILE_PATTERN.search(font_path.name)
+        if not match:
+            continue
+        encoded = base64.b64encode(font_path.read_bytes()).decode("ascii")
+        rules.append(
+            "@font-face{"
+            'font-family:"Fira Sans";font-style:normal;'
+            f"font-weight:{match.group(1)};font-display:block;"
+            f'src:url(data:font/woff2;base64,{encoded}) format("woff2");'
+            "}"
+        )
+    return "\n".join(rules)
+
+
+@lru_cache
+def load_template_assets() -> Optional[TemplateAssets]:
+    css_path = ASSETS_DIR / "report.css"
+    fonts_dir = ASSETS_DIR / "fonts"
+
+    if not (css_path.exists() and fonts_dir.is_dir()):
+        print(
+            f"Template assets not found in {ASSETS_DIR} (run `make template-assets`); "
+            "falling back to CDN styles"
+        )
+        return None
+
+    fonts_css = font_face_css(fonts_dir)
+    if not fonts_css:
+        print(f"No Fira Sans fonts in {fonts_dir}; using fallback fonts")
+
+    print(f"Inlining template assets from {ASSETS_DIR}")
+    return {
+        "css": fonts_css + "\n" + css_path.read_text(encoding="utf-8"),
+    }
+
+
+@lru_cache
+def template_version() -> str:
+    digest = hashlib.sha256(TEMPLATE_PATH.read_bytes())
+    assets = load_template_assets()
+    digest.update(assets["css"].encode("utf-8") if assets else b"cdn")
+    return digest.hexdigest()[:16]
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable
+from aio_pika.abc import AbstractIncomingMessage
+
+
+class JobScheduler:
+    # The broker never delivers more than max_jobs unacked messages (prefetch),
+    # and messages are acked only when their job is done, so a burst of
+    # uploads waits in the queue instead of in this process's memory.
+    def __init__(
+        self,
+        handler: Callable[[AbstractIncomingMessage], Awaitable[None]],
+        max_jobs: int,
+        label: str = "job",
+    ):
+        self.handler = handler
+        self.max_jobs = max_jobs
+        self.label = label
+        self._slots = asyncio.Semaphore(max_jobs)
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, message: AbstractIncomingMessage) -> None:
+        task = asyncio.create_task(self._run(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, message: AbstractIncomingMessage) -> None:
+        label = self.label.capitalize()
+        try:
+            async with self._slots:
+                print(f"{label} started ({self.in_flight}/{self.max_jobs} in flight)")
+                await self.handler(message)
+        except asyncio.CancelledError:
+            # CancelledError is not an Exception; without this the message
+            # would sit unacked until the channel closes. Jobs still waiting
+            # for a slot land here too.
+            print(f"{label} cancelled, requeueing message")
+            try:
+                await message.nack(requeue=True)
+            except Exception as nack_err:
+                print(f"Failed to nack message: {nack_err}")
+            raise
+        except Exception as e:
+            # Unexpected crash outside the job's own error handling: give
+            # the message back so another worker (or a restart) retries.
+            print(f"{label} crashed, requeueing message: {e}")
+            try:
+                await message.nack(requeue=True)
+            except Exception as nack_err:
+                print(f"Failed to nack message: {nack_err}")
+
+    async def drain(self, timeout: float) -> None:
+        if not self._tasks:
+            return
+        print(
+            f"Waiting up to {timeout:.0f}s for {self.in_flight} running "
+            f"{self.label}(s)..."
+        )
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Their messages were never acked and will be redelivered.
+            print(f"Cancelled {len(pending)} unfinished {self.label}(s)")
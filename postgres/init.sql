@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS report_files (
     s3_key TEXT NOT NULL,
     status file_status DEFAULT 'pending',
     error TEXT DEFAULT NULL,
+    sha256 TEXT DEFAULT NULL,
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW(),
 
@@ -26,4 +27,5 @@ CREATE TABLE IF NOT EXISTS report_files (
     CONSTRAINT uix_report_s3key UNIQUE (report_id, s3_key)
 );
 
-CREATE INDEX IF NOT EXISTS idx_report_files_report_id ON report_files(report_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_report_files_report_id ON report_files(report_id);
+CREATE INDEX IF NOT EXISTS ix_report_files_sha256 ON report_files(sha256);
\ No newline at end of file
@@ -0,0 +1,14 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  content: {
+    relative: true,
+    files: ["./report.html"],
+  },
+  theme: {
+    extend: {
+      fontFamily: {
+        fira: ["Fira Sans", "sans-serif"],
+      },
+    },
+  },
+};